@@ -0,0 +1 @@
+# 여러 페이지(pages/*.py)가 함께 쓰는 공용 모듈 모음
@@ -0,0 +1,206 @@
+# ----------------------------------------------------------
+# 강원랜드 외국인 입장 데이터 (입장일자, 국가명, 외국인 입장객 수)
+# ----------------------------------------------------------
+# 05 / 07 페이지가 함께 쓰는 집계 묶음. 데이터 버전마다 한 번만 계산해 두고
+# 위젯 조작(국가 선택, 검색)은 미리 만든 결과를 조회만 하도록 한다.
+
+import copy
+import threading
+from functools import cached_property
+
+import numpy as np
+import pandas as pd
+
+DATE_COL = "입장일자"
+COUNTRY_COL = "국가명"
+COUNT_COL = "외국인 입장객 수"
+REQUIRED_COLUMNS = [DATE_COL, COUNTRY_COL, COUNT_COL]
+
+
+def to_typed(df: pd.DataFrame) -> pd.DataFrame:
+    """필수 컬럼 검사 후 입장일자는 datetime(에러는 NaT), 입장객 수는 int로 변환"""
+    missing = [c for c in REQUIRED_COLUMNS if c not in df.columns]
+    if missing:
+        raise ValueError(f"CSV에 필수 컬럼이 없습니다: {missing}. (필수: {REQUIRED_COLUMNS})")
+    df[DATE_COL] = pd.to_datetime(df[DATE_COL], errors="coerce")
+    df[COUNT_COL] = pd.to_numeric(df[COUNT_COL], errors="coerce").fillna(0).astype(int)
+    return df
+
+
+class _RowBuffer:
+    """열마다 여유 용량이 있는 numpy 배열에 행을 이어 붙이는 버퍼
+
+    앞쪽 filled행은 다시 쓰지 않으므로, 각 요약(snapshot)은 자기 행 수만큼의 앞부분을
+    복사 없이 DataFrame으로 본다. 용량이 차면 1.5배로 늘리므로 추가 비용은 행당 (분할 상환) 상수.
+    """
+
+    def __init__(self, df: pd.DataFrame):
+        self.columns = list(df.columns)
+        self.filled = len(df)
+        capacity = self.filled + max(self.filled // 4, 1024)
+        self.arrays = {}
+        for c in self.columns:
+            values = df[c].to_numpy()
+            arr = np.empty(capacity, dtype=values.dtype)
+            arr[:self.filled] = values
+            self.arrays[c] = arr
+        self._lock = threading.Lock()
+
+    @classmethod
+    def from_frame(cls, df: pd.DataFrame):
+        """numpy 열로만 된 프레임이면 버퍼, 확장 dtype(범주형 등)이 있으면 None"""
+        if df.columns.has_duplicates or not all(isinstance(t, np.dtype) for t in df.dtypes):
+            return None
+        return cls(df)
+
+    def append(self, tail: pd.DataFrame, expect_rows: int) -> bool:
+        """filled가 expect_rows일 때만 tail을 이어 붙인다. 열/타입이 안 맞으면 False"""
+        if list(tail.columns) != self.columns:
+            return False
+        values = {}
+        for c in self.columns:
+            src, dst = tail[c].to_numpy(), self.arrays[c].dtype
+            if src.dtype != dst and not (dst == object or np.can_cast(src.dtype, dst, "same_kind")):
+                return False
+            values[c] = src
+        with self._lock:
+            # 같은 요약에서 두 번 extend하면 뒤쪽 행이 겹치므로 맨 끝 요약에서만 이어 붙인다
+            if self.filled != expect_rows:
+                return False
+            end = self.filled + len(tail)
+            if end > len(self.arrays[self.columns[0]]):
+                capacity = max(len(self.arrays[self.columns[0]]) * 3 // 2, end)
+                for c in self.columns:
+                    grown = np.empty(capacity, dtype=self.arrays[c].dtype)
+                    grown[:self.filled] = self.arrays[c][:self.filled]
+                    self.arrays[c] = grown
+            for c in self.columns:
+                self.arrays[c][self.filled:end] = values[c]
+            self.filled = end
+        return True
+
+    def view(self, rows: int) -> pd.DataFrame:
+        """앞 rows행을 복사 없이 보는 프레임 (공유 객체이므로 수정하지 말 것)"""
+        # dtype을 명시해야 object 열도 타입 추론(전체 스캔·임시 복사) 없이 그대로 감싼다
+        return pd.DataFrame(
+            {c: pd.Series(self.arrays[c][:rows], dtype=self.arrays[c].dtype, copy=False) for c in self.columns},
+            copy=False,
+        )
+
+
+class AdmissionsSummary:
+    """국가별 합계, 일자별 합계, 국가 → 행 위치 인덱스, 국가별 최대/최소 방문일
+
+    - frame: 원본 행 (0부터 다시 매긴 인덱스, 도착 순서 그대로, 수정하지 말 것)
+    - positions: 국가 → 입장일자 순 행 위치 배열 묶음 (tuple)
+    - country_totals: 국가별 총 방문객 (내림차순)
+    - daily: 일자별 총 방문객
+    - describe: df.describe(include="all") 결과 (처음 볼 때 계산)
+
+    extend()로 새로 들어온 행만 더한 새 요약을 만들 수 있다 (기존 객체는 그대로).
+    행은 _RowBuffer에 이어 붙이므로 추가 비용은 새 행 수에 비례하고 기존 행은 복사하지 않는다.
+    """
+
+    def __init__(self, df: pd.DataFrame):
+        self._buffer = _RowBuffer.from_frame(df)
+        self.frame = df.reset_index(drop=True) if self._buffer is None else self._buffer.view(len(df))
+        self.rows = len(self.frame)
+        self.last_date = self.frame[DATE_COL].max()
+        self._country_sums = self.frame.groupby(COUNTRY_COL, dropna=False)[COUNT_COL].sum()
+        self._daily_sums = self.frame.groupby(DATE_COL)[COUNT_COL].sum()
+
+        # 국가, 날짜 순으로 한 번 정렬해 두고 국가별 행 위치만 기억
+        ordered = self.frame.dropna(subset=[COUNTRY_COL]).sort_values([COUNTRY_COL, DATE_COL], kind="stable")
+        groups = ordered.groupby(COUNTRY_COL, sort=False)
+        labels = ordered.index.to_numpy()
+        # 국가 → 행 위치 배열 묶음 (extend 때마다 새 배열을 뒤에 붙이고, 조회할 때 이어 붙인다)
+        self.positions = {c: (labels[idx],) for c, idx in groups.indices.items()}
+
+        counts = groups[COUNT_COL]
+        self.max_pos = counts.idxmax().to_dict()
+        self.min_pos = counts.idxmin().to_dict()
+        self._finish()
+
+    def _finish(self):
+        """누적 합계에서 화면용 표와 국가 목록을 다시 만든다 (국가/일자 수에 비례)"""
+        self.country_totals = (
+            self._country_sums.astype(int).sort_index().sort_values(ascending=False, kind="stable")
+            .rename_axis(COUNTRY_COL).reset_index()
+        )
+        self.daily = self._daily_sums.astype(int).sort_index().rename_axis(DATE_COL).reset_index()
+        self.countries = sorted(self.positions)
+        self.totals = {c: v for c, v in self._country_sums.items() if not pd.isna(c)}
+
+    @cached_property
+    def describe(self) -> pd.DataFrame:
+        return self.frame.describe(include="all")
+
+    def extend(self, tail: pd.DataFrame) -> "AdmissionsSummary":
+        """tail(타입 변환이 끝난 새 행)을 더한 새 요약
+
+        새 행의 입장일자가 모두 마지막으로 반영된 일자 이후(같은 날 포함)이면
+        tail만 집계해서 기존 합계에 더한다. 날짜가 비었거나 과거 일자가 섞여 있으면
+        국가별 날짜 순서를 보장할 수 없으므로 전체를 다시 계산한다.
+        """
+        if tail.empty:
+            return self
+        dates = tail[DATE_COL]
+        if dates.isna().any() or (pd.notna(self.last_date) and dates.min() < self.last_date):
+            return AdmissionsSummary(pd.concat([self.frame, tail], ignore_index=True))
+
+        new = copy.copy(self)
+        new.__dict__.pop("describe", None)
+        rows = self.rows + len(tail)
+        if self._buffer is not None and self._buffer.append(tail, self.rows):
+            frame = self._buffer.view(rows)
+        else:
+            # 버퍼에 붙일 수 없으면(열/타입 불일치, 이미 다른 요약이 이어 붙임) 한 번 복사해 새 버퍼로
+            frame = pd.concat([self.frame, tail], ignore_index=True)
+            new._buffer = _RowBuffer.from_frame(frame)
+            if new._buffer is not None:
+                frame = new._buffer.view(rows)
+        new.frame = frame
+        new.rows = rows
+        new.last_date = dates.max() if pd.isna(self.last_date) else max(self.last_date, dates.max())
+
+        added = frame.iloc[self.rows:]
+        new._country_sums = self._country_sums.add(
+            added.groupby(COUNTRY_COL, dropna=False)[COUNT_COL].sum(), fill_value=0)
+        new._daily_sums = self._daily_sums.add(added.groupby(DATE_COL)[COUNT_COL].sum(), fill_value=0)
+
+        # 새 행은 기존 행보다 날짜가 늦으므로 국가별 위치 목록 뒤에 이어 붙이면 정렬이 유지된다
+        new.positions = dict(self.positions)
+        new.max_pos = dict(self.max_pos)
+        new.min_pos = dict(self.min_pos)
+        ordered = added.dropna(subset=[COUNTRY_COL]).sort_values([COUNTRY_COL, DATE_COL], kind="stable")
+        groups = ordered.groupby(COUNTRY_COL, sort=False)
+        labels = ordered.index.to_numpy()
+        counts = frame[COUNT_COL].to_numpy()
+        for c, idx in groups.indices.items():
+            pos = labels[idx]
+            new.positions[c] = new.positions.get(c, ()) + (pos,)
+            hi = pos[counts[pos].argmax()]
+            lo = pos[counts[pos].argmin()]
+            # 같은 값이면 먼저(과거) 나온 행을 유지 (전체 계산의 idxmax/idxmin과 동일)
+            if c not in self.max_pos or counts[hi] > counts[self.max_pos[c]]:
+                new.max_pos[c] = hi
+            if c not in self.min_pos or counts[lo] < counts[self.min_pos[c]]:
+                new.min_pos[c] = lo
+        new._finish()
+        return new
+
+    def __contains__(self, country) -> bool:
+        return country in self.positions
+
+    def country_rows(self, country) -> pd.DataFrame:
+        """해당 국가의 행 (입장일자 오름차순). 없으면 빈 프레임"""
+        chunks = self.positions.get(country, ())
+        pos = chunks[0] if len(chunks) == 1 else np.concatenate(chunks) if chunks else []
+        return self.frame.iloc[pos][[DATE_COL, COUNTRY_COL, COUNT_COL]]
+
+    def total(self, country) -> int:
+        return int(self.totals.get(country, 0))
+
+    def extremes(self, country):
+        """(최대 방문일 행, 최소 방문일 행) - 각각 입장일자/외국인 입장객 수"""
+        return self.frame.iloc[self.max_pos[country]], self.frame.iloc[self.min_pos[country]]
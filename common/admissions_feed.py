@@ -0,0 +1,101 @@
+# ----------------------------------------------------------
+# 하루치씩 덧붙는 입장 CSV를 증분으로 따라가는 로더
+# ----------------------------------------------------------
+# 인공지능 수행.csv는 매일 파일 끝에 그날 행이 추가된다. 매번 전체를 다시
+# 파싱/집계하지 않고, 마지막으로 읽은 바이트 위치(offset) 뒤의 완성된 줄만 읽어
+# AdmissionsSummary.extend()로 합계에 더한다.
+# - 파일이 줄었거나 마지막으로 읽은 줄이 바뀌었으면(덮어쓰기) 전체를 다시 읽는다.
+# - 끝에 줄바꿈이 없는 줄은 쓰는 중일 수 있으므로 다음 새로고침까지 미룬다.
+
+import hashlib
+import io
+import os
+import threading
+from pathlib import Path
+
+import pandas as pd
+
+from common import admissions
+from common.admissions import AdmissionsSummary
+from common.csv_loader import read_csv_auto, sniff_encoding
+
+
+class AdmissionsFeed:
+    """파일 끝에 추가된 행만 읽어 요약을 갱신하는 입장 데이터 피드
+
+    refresh()가 돌려주는 상태: "full"(전체 로드) / "append"(추가분만 반영) / "unchanged"
+    summary는 갱신 때마다 새 객체로 바뀌므로 이미 꺼낸 요약은 그대로 써도 안전하다.
+    """
+
+    def __init__(self, path):
+        self.path = Path(path)
+        self.summary = None
+        self.offset = 0          # 지금까지 반영한 바이트 수 (완성된 줄 기준)
+        self.encoding = None
+        self.columns = None
+        self.last_added = 0      # 마지막 새로고침에서 반영한 행 수
+        self._last_line = b""    # offset 바로 앞 줄 (덮어쓰기 감지용)
+        self._stat = None        # 마지막으로 확인한 (크기, 수정시각)
+        self._lock = threading.Lock()
+
+    @property
+    def version(self) -> str:
+        """반영한 내용이 바뀌면 달라지는 버전 (차트/캐시 키)"""
+        return f"{self.offset}-{hashlib.sha1(self._last_line).hexdigest()[:8]}"
+
+    def refresh(self) -> str:
+        with self._lock:
+            stat = os.stat(self.path)
+            if self.summary is not None and (stat.st_size, stat.st_mtime_ns) == self._stat:
+                self.last_added = 0
+                return "unchanged"
+            self._stat = (stat.st_size, stat.st_mtime_ns)
+            if self.summary is None or stat.st_size < self.offset or not self._same_tail():
+                return self._load_full()
+            return self._load_tail()
+
+    def _same_tail(self) -> bool:
+        """이미 읽은 마지막 줄이 그대로인지 (파일 앞부분 전체를 다시 해시하지 않음)"""
+        if not self._last_line.endswith(b"\n"):
+            return False
+        with open(self.path, "rb") as f:
+            f.seek(self.offset - len(self._last_line))
+            return f.read(len(self._last_line)) == self._last_line
+
+    def _load_full(self) -> str:
+        data = self.path.read_bytes()
+        raw = read_csv_auto(data)
+        self.encoding = sniff_encoding(data)
+        if self.encoding == "utf-8-sig":
+            self.encoding = "utf-8"  # BOM은 파일 맨 앞에만 있다
+        self.columns = list(raw.columns)
+        self.summary = AdmissionsSummary(admissions.to_typed(raw))
+        self.offset = len(data)
+        self._last_line = _last_line(data)
+        self.last_added = self.summary.rows
+        return "full"
+
+    def _load_tail(self) -> str:
+        with open(self.path, "rb") as f:
+            f.seek(self.offset)
+            chunk = f.read()
+        end = chunk.rfind(b"\n") + 1
+        if end == 0:
+            self.last_added = 0
+            return "unchanged"
+        chunk = chunk[:end]
+        tail = pd.read_csv(
+            io.BytesIO(chunk), header=None, names=self.columns,
+            encoding=self.encoding, encoding_errors="replace",
+        )
+        self.summary = self.summary.extend(admissions.to_typed(tail))
+        self.offset += end
+        self._last_line = _last_line(chunk)
+        self.last_added = len(tail)
+        return "append"
+
+
+def _last_line(data: bytes) -> bytes:
+    """마지막 줄 (줄바꿈 포함)"""
+    start = data.rfind(b"\n", 0, len(data) - 1) + 1
+    return data[start:]
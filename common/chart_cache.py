@@ -0,0 +1,90 @@
+# ----------------------------------------------------------
+# 차트 캐시 (데이터 버전 + 선택값 → 만들어 둔 차트, LRU)
+# ----------------------------------------------------------
+# 관련 없는 위젯만 바뀐 재실행에서도 그림을 처음부터 다시 만들지 않도록,
+# (데이터 버전, 차트 이름, 선택한 국가/노선/날짜/유형 ...) 키로 결과를 보관한다.
+# - 페이지마다 따로 LRU를 두므로 한 페이지의 차트가 다른 페이지 차트를 밀어내지 않는다.
+# - Plotly: 완성된 go.Figure 객체를 보관 (그리기는 공개 API st.plotly_chart)
+# - Altair: 검증/변환이 끝난 Vega-Lite spec(dict)을 보관해 st.vega_lite_chart로 바로 그림.
+#   행이 많은 차트도 전역 설정(disable_max_rows)을 건드리지 않고 변환한다.
+# 보관된 그림과 spec은 모든 세션이 공유하므로 꺼낸 뒤 수정하지 않는다.
+
+import threading
+from collections import OrderedDict
+
+import streamlit as st
+from streamlit.runtime.scriptrunner import get_script_run_ctx
+
+from common.lazy import lazy_import
+
+alt = lazy_import("altair")  # 캐시에 없는 Altair 차트를 처음 변환할 때만 import
+pd = lazy_import("pandas")
+
+MAX_CHARTS = 64  # 페이지당
+MAX_ROWS = 5000  # Altair 기본 행 수 제한 (넘는 데이터는 직접 값으로 변환)
+
+
+class LRUCache:
+    """스레드 안전한 단순 LRU (가장 오래 안 쓴 항목부터 제거)"""
+
+    def __init__(self, max_entries: int = MAX_CHARTS):
+        self.max_entries = max_entries
+        self._items = OrderedDict()
+        self._lock = threading.Lock()
+        self.hits = 0
+        self.misses = 0
+
+    def get_or_build(self, key, build):
+        with self._lock:
+            if key in self._items:
+                self._items.move_to_end(key)
+                self.hits += 1
+                return self._items[key]
+        value = build()
+        with self._lock:
+            self.misses += 1
+            self._items[key] = value
+            self._items.move_to_end(key)
+            while len(self._items) > self.max_entries:
+                self._items.popitem(last=False)
+        return value
+
+    def __len__(self):
+        return len(self._items)
+
+
+_pages = {}  # 페이지 스크립트 해시 → LRUCache
+_pages_lock = threading.Lock()
+
+
+def page_charts() -> LRUCache:
+    """현재 페이지의 차트 캐시 (스크립트 실행 밖에서는 공용 캐시 하나)"""
+    ctx = get_script_run_ctx()
+    page = ctx.page_script_hash if ctx is not None else ""
+    with _pages_lock:
+        if page not in _pages:
+            _pages[page] = LRUCache()
+        return _pages[page]
+
+
+def show_plotly(key: tuple, build, **kwargs):
+    """key에 해당하는 Plotly 그림이 없을 때만 build()로 만들고 st.plotly_chart로 표시"""
+    fig = page_charts().get_or_build(("plotly",) + tuple(key), build)
+    st.plotly_chart(fig, **kwargs)
+
+
+def _altair_spec(build) -> dict:
+    chart = build()
+    data = chart.data
+    if not isinstance(data, pd.DataFrame) or len(data) <= MAX_ROWS:
+        return chart.to_dict()
+    # 행이 많으면 첫 행만으로 spec을 검증/변환하고 데이터셋 값만 전체로 바꾼다
+    spec = chart.properties(data=data.iloc[:1]).to_dict()
+    spec["datasets"][spec["data"]["name"]] = alt.utils.data.to_values(data)["values"]
+    return spec
+
+
+def show_altair(key: tuple, build, **kwargs):
+    """key에 해당하는 Vega-Lite spec이 없을 때만 Altair 차트를 build()해서 변환, 표시"""
+    spec = page_charts().get_or_build(("vega",) + tuple(key), lambda: _altair_spec(build))
+    st.vega_lite_chart(spec, **kwargs)
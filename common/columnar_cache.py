@@ -0,0 +1,93 @@
+# ----------------------------------------------------------
+# CSV → Parquet 컬럼형 캐시
+# ----------------------------------------------------------
+# 원본 CSV를 한 번만 파싱해서 타입이 정해진 Parquet 파일로 저장해 두고,
+# 이후 로드에서는 텍스트를 다시 파싱하지 않고 Parquet를 메모리 매핑으로 읽는다.
+# 캐시 키는 원본 파일의 (경로, 크기, 수정시각)이라 파일이 바뀌면 자동으로 다시 만든다.
+# Streamlit 세션은 한 프로세스의 스레드이므로, 같은 캐시 파일을 만드는 작업은 잠금으로
+# 한 번만 하고 임시 파일 이름은 작업마다 따로 받는다.
+
+import hashlib
+import os
+import re
+import tempfile
+import threading
+from pathlib import Path
+
+from common.lazy import lazy_import
+
+pd = lazy_import("pandas")
+
+CACHE_DIR = Path(__file__).resolve().parent.parent / ".cache"
+
+_locks = {}  # 캐시 파일 경로 → 만들기 잠금
+_locks_guard = threading.Lock()
+
+
+def _target_lock(target: Path) -> threading.Lock:
+    with _locks_guard:
+        return _locks.setdefault(str(target), threading.Lock())
+
+
+def path_tag(path) -> str:
+    """절대 경로의 짧은 해시 (이름이 같은 다른 폴더의 파일과 캐시 이름이 겹치지 않게)"""
+    return hashlib.sha1(os.path.abspath(path).encode("utf-8")).hexdigest()[:8]
+
+
+def source_fingerprint(path) -> str:
+    """원본 파일의 경로/크기/수정시각으로 만든 짧은 해시"""
+    path = os.path.abspath(path)
+    stat = os.stat(path)
+    raw = f"{path}|{stat.st_size}|{stat.st_mtime_ns}"
+    return hashlib.sha1(raw.encode("utf-8")).hexdigest()[:16]
+
+
+def sources_fingerprint(paths) -> str:
+    """여러 원본 파일 묶음의 지문 (파일이 추가/수정/삭제되면 바뀜)"""
+    raw = "|".join(f"{os.path.abspath(p)}:{source_fingerprint(p)}" for p in sorted(paths))
+    return hashlib.sha1(raw.encode("utf-8")).hexdigest()[:16]
+
+
+def cached_build(name: str, fingerprint: str, build, columns=None) -> "pd.DataFrame":
+    """name-fingerprint.parquet 캐시가 있으면 읽고, 없으면 build()로 만든 뒤 저장
+
+    columns를 주면 해당 열만 읽으므로 읽는 비용이 열 개수에 비례한다.
+    """
+    target = CACHE_DIR / f"{name}-{fingerprint}.parquet"
+    if not target.exists():
+        # 같은 캐시를 동시에 요청한 세션은 먼저 온 세션이 다 만들 때까지 기다렸다가 읽기만 한다
+        with _target_lock(target):
+            if not target.exists():
+                df = build()
+                CACHE_DIR.mkdir(parents=True, exist_ok=True)
+                # 다른 프로세스가 동시에 읽어도 깨진 파일을 보지 않도록 임시 파일에 쓴 뒤 교체
+                fd, tmp = tempfile.mkstemp(prefix=f".{target.name}.", suffix=".tmp", dir=CACHE_DIR)
+                os.close(fd)
+                try:
+                    df.to_parquet(tmp, index=False)
+                    os.replace(tmp, target)
+                except BaseException:
+                    try:
+                        os.unlink(tmp)
+                    except OSError:
+                        pass
+                    raise
+                _remove_stale(target, name)
+    return pd.read_parquet(target, columns=columns, memory_map=True)
+
+
+def cached_frame(path, convert, columns=None, tag: str = "") -> "pd.DataFrame":
+    """원본 CSV 하나를 convert(path)로 변환한 결과를 캐시해서 반환"""
+    name = f"{Path(path).stem}-{path_tag(path)}" + (f"-{tag}" if tag else "")
+    return cached_build(name, source_fingerprint(path), lambda: convert(path), columns)
+
+
+def _remove_stale(current: Path, name: str):
+    """같은 이름(name-지문.parquet)으로 만들어진 예전 버전 캐시 삭제"""
+    pattern = re.compile(re.escape(name) + r"-[0-9a-f]{16}\.parquet")
+    for old in current.parent.glob("*.parquet"):
+        if old != current and pattern.fullmatch(old.name):
+            try:
+                old.unlink()
+            except OSError:
+                pass
@@ -0,0 +1,107 @@
+# ----------------------------------------------------------
+# 인코딩 감지 후 한 번만 파싱하는 공용 CSV 로더
+# ----------------------------------------------------------
+# 공공데이터 CSV는 대부분 CP949라서 "UTF-8로 전체 파싱 → 실패 → CP949로 재파싱"
+# 방식은 파싱 비용을 두세 배로 만든다. 여기서는 앞부분 바이트만 보고
+# BOM / UTF-8 / CP949를 판별한 다음 pandas 파싱은 정확히 한 번만 한다.
+
+import codecs
+import io
+import os
+import urllib.request
+from functools import lru_cache
+
+import pandas as pd
+
+SNIFF_BYTES = 64 * 1024
+
+
+def sniff_encoding(data: bytes) -> str:
+    """바이트 앞부분으로 인코딩 판별 (utf-8-sig / utf-8 / cp949)
+
+    ASCII만 있는 구간은 판별 근거가 없으므로 ASCII가 아닌 바이트가
+    처음 나오는 블록까지 건너뛰고 그 블록으로 판단한다.
+    """
+    if data.startswith(codecs.BOM_UTF8):
+        return "utf-8-sig"
+    view = memoryview(data)
+    for start in range(0, len(data), SNIFF_BYTES):
+        # 블록 경계에서 멀티바이트 문자가 잘리지 않도록 앞 3바이트를 겹쳐서 본다
+        block = bytes(view[max(0, start - 3):start + SNIFF_BYTES])
+        if not block.isascii():
+            return _utf8_or_cp949(block)
+    return "utf-8"
+
+
+def _utf8_or_cp949(block: bytes) -> str:
+    decoder = codecs.getincrementaldecoder("utf-8")()
+    # 블록 앞의 잘린 continuation 바이트(0x80-0xBF)는 건너뛴다
+    i = 0
+    while i < min(3, len(block)) and 0x80 <= block[i] <= 0xBF:
+        i += 1
+    try:
+        decoder.decode(block[i:], final=False)
+        return "utf-8"
+    except UnicodeDecodeError:
+        return "cp949"
+
+
+def sniff_file_encoding(path) -> str:
+    """파일 인코딩 판별 (같은 파일 버전은 결과를 캐시)"""
+    stat = os.stat(path)
+    return _sniff_file_cached(os.path.abspath(path), stat.st_size, stat.st_mtime_ns)
+
+
+@lru_cache(maxsize=256)
+def _sniff_file_cached(path: str, size: int, mtime_ns: int) -> str:
+    with open(path, "rb") as f:
+        head = f.read(SNIFF_BYTES)
+        if head.startswith(codecs.BOM_UTF8):
+            return "utf-8-sig"
+        tail = b""
+        while head:
+            block = tail + head
+            if not block.isascii():
+                return _utf8_or_cp949(block)
+            tail = head[-3:]
+            head = f.read(SNIFF_BYTES)
+    return "utf-8"
+
+
+def is_url(source) -> bool:
+    return isinstance(source, str) and source.startswith(("http://", "https://"))
+
+
+def fetch_url_bytes(url: str, timeout: float = 30) -> bytes:
+    """URL 내용을 바이트로 한 번만 내려받기"""
+    with urllib.request.urlopen(url, timeout=timeout) as resp:
+        return resp.read()
+
+
+def url_version(url: str, timeout: float = 10) -> str:
+    """HEAD 요청으로 얻은 ETag / Last-Modified / 크기 (버전 식별용)
+
+    서버가 아무 것도 주지 않거나 요청이 실패하면 빈 문자열을 돌려준다.
+    """
+    try:
+        req = urllib.request.Request(url, method="HEAD")
+        with urllib.request.urlopen(req, timeout=timeout) as resp:
+            headers = resp.headers
+            return "|".join(headers.get(h, "") for h in ("ETag", "Last-Modified", "Content-Length")).strip("|")
+    except Exception:
+        return ""
+
+
+def read_csv_auto(source, **kwargs) -> pd.DataFrame:
+    """경로 / URL / 바이트를 받아 인코딩 감지 후 한 번만 파싱
+
+    판별한 인코딩으로도 깨지는 바이트는 대체 문자로 바꿔서 재시도 없이 읽는다.
+    """
+    kwargs.setdefault("encoding_errors", "replace")
+    if is_url(source):
+        source = fetch_url_bytes(source)
+    if isinstance(source, (bytes, bytearray)):
+        if len(source) == 0:
+            raise pd.errors.EmptyDataError("File is empty (0 bytes).")
+        return pd.read_csv(io.BytesIO(source), encoding=sniff_encoding(bytes(source)), **kwargs)
+    return pd.read_csv(source, encoding=sniff_file_encoding(source), **kwargs)
@@ -0,0 +1,102 @@
+# ----------------------------------------------------------
+# 데이터셋 레지스트리 (main.py와 pages/*.py 공용)
+# ----------------------------------------------------------
+# 앱에서 쓰는 번들 데이터 파일을 이름으로 등록해 두고, 한 프로세스 안에서는
+# 파일 버전(경로/크기/수정시각)마다 한 번만 읽어 모든 페이지·세션이 같은 프레임을 공유한다.
+# 반환된 프레임은 공유 객체이므로 페이지에서 직접 수정하지 말고 복사해서 쓴다.
+# 경로는 환경변수로 덮어쓸 수 있다 (벤치마크나 다른 데이터로 시험할 때).
+
+import os
+import threading
+from collections import namedtuple
+from pathlib import Path
+
+from common.columnar_cache import source_fingerprint
+from common.lazy import lazy_import
+
+# 실제 로더(pandas 포함)는 데이터를 처음 읽을 때 import (main.py처럼 상태만 볼 때는 불필요)
+admissions = lazy_import("common.admissions")
+csv_loader = lazy_import("common.csv_loader")
+mbti = lazy_import("common.mbti")
+recommendations = lazy_import("common.recommendations")
+spots = lazy_import("common.spots")
+subway = lazy_import("common.subway")
+
+ROOT = Path(__file__).resolve().parent.parent
+
+# name: 등록 이름 / label: 화면 표시용 / filename: 기본 파일 / env: 경로를 덮어쓸 환경변수
+# loader: 경로 → 타입 변환까지 끝난 DataFrame (관광지/역 좌표는 dict 목록, 추천은 Catalogue)
+DatasetSpec = namedtuple("DatasetSpec", ["name", "label", "filename", "env", "loader"])
+
+DATASETS = {
+    spec.name: spec
+    for spec in [
+        DatasetSpec(
+            "mbti_countries", "국가별 MBTI 16유형 비율", "countriesMBTI_16types.csv",
+            "MBTI_COUNTRIES_CSV", lambda path: mbti.to_typed(csv_loader.read_csv_auto(path)),
+        ),
+        DatasetSpec(
+            "subway", "지하철 일별 역별 승하차", "wnlgkcjf.csv",
+            "SUBWAY_CSV", lambda path: subway.load_subway(path),
+        ),
+        DatasetSpec(
+            "admissions", "강원랜드 외국인 일일 입장", "인공지능 수행.csv",
+            "ADMISSIONS_CSV", lambda path: admissions.to_typed(csv_loader.read_csv_auto(path)),
+        ),
+        DatasetSpec(
+            "seoul_spots", "서울 관광지 (POI)", "data/seoul_spots.json",
+            "SEOUL_SPOTS_JSON", lambda path: spots.load_spots(path),
+        ),
+        DatasetSpec(
+            "subway_stations", "지하철역 좌표", "data/subway_stations.csv",
+            "SUBWAY_STATIONS_CSV", lambda path: spots.load_stations(path),
+        ),
+        DatasetSpec(
+            "mbti_recommendations", "MBTI 진로/영화/책 추천", "data/mbti_recommendations.json",
+            "MBTI_RECS_JSON", lambda path: recommendations.load_catalogue(path),
+        ),
+    ]
+}
+
+_loaded = {}  # name → (version, 로드된 데이터)
+_lock = threading.Lock()
+
+
+def dataset_path(name: str) -> Path:
+    spec = DATASETS[name]
+    return Path(os.environ.get(spec.env) or ROOT / spec.filename)
+
+
+def dataset_exists(name: str) -> bool:
+    return dataset_path(name).is_file()
+
+
+def dataset_version(name: str) -> str:
+    """데이터 파일이 바뀌면 달라지는 버전 문자열 (캐시 키로 사용)"""
+    return source_fingerprint(dataset_path(name))
+
+
+def load_dataset(name: str):
+    """등록된 데이터셋을 로드 (같은 버전은 프로세스 전체에서 한 번만 파싱)
+
+    파일이 없으면 FileNotFoundError, 필수 컬럼이 없으면 ValueError.
+    """
+    path = dataset_path(name)
+    if not path.is_file():
+        raise FileNotFoundError(f"데이터 파일을 찾을 수 없습니다: {path}")
+    version = source_fingerprint(path)
+    cached = _loaded.get(name)
+    if cached and cached[0] == version:
+        return cached[1]
+    with _lock:
+        cached = _loaded.get(name)
+        if cached and cached[0] == version:
+            return cached[1]
+        df = DATASETS[name].loader(path)
+        _loaded[name] = (version, df)
+        return df
+
+
+def is_loaded(name: str) -> bool:
+    cached = _loaded.get(name)
+    return bool(cached) and dataset_exists(name) and cached[0] == dataset_version(name)
@@ -0,0 +1,116 @@
+# ----------------------------------------------------------
+# 위경도 계산과 격자 공간 인덱스
+# ----------------------------------------------------------
+# 지도 페이지(02)에서 "지금 화면 안의 점"과 "클릭한 곳에서 가까운 점"을 찾을 때
+# 전체 점을 매번 훑지 않도록, 점들을 위경도 격자(cell)에 나눠 담아 두고
+# 겹치는 칸 / 주변 칸만 본다.
+
+import math
+
+import numpy as np
+
+EARTH_RADIUS_KM = 6371.0088
+
+
+def haversine_km(lat1, lon1, lat2, lon2):
+    """두 좌표(배열 가능, 브로드캐스트) 사이의 대원 거리 (km)"""
+    lat1, lon1, lat2, lon2 = (np.radians(np.asarray(v, dtype="float64")) for v in (lat1, lon1, lat2, lon2))
+    a = np.sin((lat2 - lat1) / 2) ** 2 + np.cos(lat1) * np.cos(lat2) * np.sin((lon2 - lon1) / 2) ** 2
+    return 2 * EARTH_RADIUS_KM * np.arcsin(np.sqrt(np.minimum(a, 1.0)))
+
+
+class GridIndex:
+    """위경도 격자 인덱스
+
+    - in_bounds(s, w, n, e): 사각형(화면 범위) 안 점 위치
+    - nearest(lat, lon, k): 가까운 k개 점 위치와 거리(km), 가까운 순
+    """
+
+    def __init__(self, lats, lons, cell_deg: float = 0.01):
+        self.lats = np.asarray(lats, dtype="float64")
+        self.lons = np.asarray(lons, dtype="float64")
+        self.cell = cell_deg
+        rows = np.floor(self.lats / cell_deg).astype(np.int64)
+        cols = np.floor(self.lons / cell_deg).astype(np.int64)
+        # 칸 번호로 정렬한 뒤 칸마다 시작/끝 위치만 기억
+        order = np.lexsort((cols, rows))
+        keys = np.stack([rows[order], cols[order]], axis=1)
+        starts = np.flatnonzero(np.r_[True, (keys[1:] != keys[:-1]).any(axis=1)]) if len(order) else np.array([], int)
+        ends = np.r_[starts[1:], len(order)]
+        self.cells = {(int(keys[s, 0]), int(keys[s, 1])): order[s:e] for s, e in zip(starts, ends)}
+        self.row_range = (int(rows.min()), int(rows.max())) if len(order) else (0, -1)
+        self.col_range = (int(cols.min()), int(cols.max())) if len(order) else (0, -1)
+
+    def __len__(self):
+        return len(self.lats)
+
+    def _cell_of(self, lat, lon):
+        return math.floor(lat / self.cell), math.floor(lon / self.cell)
+
+    def _gather(self, r0, r1, c0, c1) -> np.ndarray:
+        """[r0, r1] × [c0, c1] 칸에 든 점 위치 (칸 수가 많으면 실제 있는 칸만 확인)"""
+        if (r1 - r0 + 1) * (c1 - c0 + 1) > len(self.cells):
+            parts = [idx for (r, c), idx in self.cells.items() if r0 <= r <= r1 and c0 <= c <= c1]
+        else:
+            parts = [self.cells[k] for k in ((r, c) for r in range(r0, r1 + 1) for c in range(c0, c1 + 1))
+                     if k in self.cells]
+        return np.concatenate(parts) if parts else np.array([], dtype=np.int64)
+
+    def in_bounds(self, south, west, north, east) -> np.ndarray:
+        r0, c0 = self._cell_of(south, west)
+        r1, c1 = self._cell_of(north, east)
+        idx = self._gather(max(r0, self.row_range[0]), min(r1, self.row_range[1]),
+                           max(c0, self.col_range[0]), min(c1, self.col_range[1]))
+        lat, lon = self.lats[idx], self.lons[idx]
+        return np.sort(idx[(lat >= south) & (lat <= north) & (lon >= west) & (lon <= east)])
+
+    def nearest(self, lat, lon, k: int = 5):
+        """가까운 k개 (위치 배열, 거리 km 배열)
+
+        클릭한 칸에서 한 겹씩 넓혀 가며 후보를 모으고, 아직 보지 않은 칸까지의 최소 거리가
+        k번째 후보 거리보다 멀어지면 멈춘다.
+        """
+        if len(self) == 0:
+            return np.array([], dtype=np.int64), np.array([])
+        k = min(k, len(self))
+        r, c = self._cell_of(lat, lon)
+        # 한 칸 폭의 최소 거리 (경도 방향은 위도에 따라 줄어든다)
+        cell_km = haversine_km(lat, lon, lat + self.cell, lon) * min(1.0, math.cos(math.radians(min(abs(lat) + self.cell, 89.9))))
+        max_ring = max(abs(r - self.row_range[0]), abs(r - self.row_range[1]),
+                       abs(c - self.col_range[0]), abs(c - self.col_range[1]))
+        ring = 0
+        while True:
+            idx = self._gather(r - ring, r + ring, c - ring, c + ring)
+            if len(idx) >= k:
+                dist = haversine_km(lat, lon, self.lats[idx], self.lons[idx])
+                kth = np.partition(dist, k - 1)[k - 1]
+                if kth <= ring * cell_km or ring >= max_ring:
+                    break
+            elif ring >= max_ring:
+                dist = haversine_km(lat, lon, self.lats[idx], self.lons[idx])
+                break
+            ring += 1
+        best = np.argsort(dist, kind="stable")[:k]
+        return idx[best], dist[best]
+
+
+def nearest_pairs(lats_a, lons_a, lats_b, lons_b, k: int = 3, block: int = 2048):
+    """A의 각 점에서 B 중 가까운 k개 (위치 (n, k), 거리 km (n, k)), 가까운 순
+
+    거리 행렬을 브로드캐스트로 한꺼번에 계산하되, A를 block개씩 나눠 메모리를 제한한다.
+    """
+    lats_a, lons_a = np.asarray(lats_a, dtype="float64"), np.asarray(lons_a, dtype="float64")
+    lats_b, lons_b = np.asarray(lats_b, dtype="float64"), np.asarray(lons_b, dtype="float64")
+    k = min(k, len(lats_b))
+    idx = np.empty((len(lats_a), k), dtype=np.int64)
+    dist = np.empty((len(lats_a), k))
+    if k == 0:
+        return idx, dist
+    for s in range(0, len(lats_a), block):
+        d = haversine_km(lats_a[s:s + block, None], lons_a[s:s + block, None], lats_b[None, :], lons_b[None, :])
+        part = np.argpartition(d, k - 1, axis=1)[:, :k] if k < d.shape[1] else np.tile(np.arange(k), (len(d), 1))
+        part_d = np.take_along_axis(d, part, axis=1)
+        order = np.argsort(part_d, axis=1, kind="stable")
+        idx[s:s + block] = np.take_along_axis(part, order, axis=1)
+        dist[s:s + block] = np.take_along_axis(part_d, order, axis=1)
+    return idx, dist
@@ -0,0 +1,81 @@
+# ----------------------------------------------------------
+# 무거운 라이브러리 지연 import
+# ----------------------------------------------------------
+# pandas / plotly / altair / folium 은 import 만으로 수백 ms가 걸린다.
+# 모듈 맨 위에서 바로 import 하면 그 라이브러리가 필요 없는 경로(예: main.py에서
+# 데이터셋 상태만 볼 때, 차트 캐시에 이미 있는 그림을 다시 보여 줄 때)에서도 비용을 낸다.
+# lazy_import()는 대리 모듈을 돌려주고, 속성에 처음 접근할 때 실제 import 를 한다.
+#
+#     go = lazy_import("plotly.graph_objects")   # 여기서는 아직 import 안 함
+#     go.Figure()                                  # 첫 사용 때 import
+#
+# 실제 import에 걸린 시간은 import_report()로 볼 수 있고, 페이지 안에서는
+# common.perf 측정 기록에도 "import" 단계로 남는다.
+# 주의: 함수 기본값이나 타입 주석처럼 정의 시점에 평가되는 곳에서 속성을 쓰면 바로 import 된다.
+
+import importlib
+import sys
+import threading
+import time
+import types
+
+_lock = threading.RLock()
+_timings = {}  # 모듈 이름 → 실제 import에 걸린 ms (이미 로드돼 있던 모듈은 0)
+
+
+class LazyModule(types.ModuleType):
+    """첫 속성 접근 때 실제 모듈을 import 하는 대리 객체"""
+
+    def __init__(self, name: str):
+        super().__init__(name)
+        self.__dict__["_lazy_module"] = None
+
+    def _load(self):
+        module = self.__dict__["_lazy_module"]
+        if module is not None:
+            return module
+        with _lock:
+            module = self.__dict__["_lazy_module"]
+            if module is None:
+                module = _import_timed(self.__name__)
+                self.__dict__["_lazy_module"] = module
+        return module
+
+    def __getattr__(self, attr):
+        return getattr(self._load(), attr)
+
+    def __dir__(self):
+        return dir(self._load())
+
+    def __repr__(self):
+        state = "loaded" if self.__dict__["_lazy_module"] is not None else "not loaded"
+        return f"<lazy module {self.__name__!r} ({state})>"
+
+
+def _import_timed(name: str):
+    if name in sys.modules:
+        _timings.setdefault(name, 0.0)
+        return sys.modules[name]
+    t0 = time.perf_counter()
+    if "streamlit" in sys.modules:
+        # 페이지 안이면 성능 측정 기록에도 남긴다 (측정이 꺼져 있으면 그냥 통과)
+        from common.perf import stage
+        with stage("import", name):
+            module = importlib.import_module(name)
+    else:
+        module = importlib.import_module(name)
+    _timings[name] = (time.perf_counter() - t0) * 1000
+    return module
+
+
+def lazy_import(name: str):
+    """이미 import 된 모듈이면 그대로, 아니면 첫 사용 때 import 하는 대리 모듈"""
+    module = sys.modules.get(name)
+    if module is not None:
+        return module
+    return LazyModule(name)
+
+
+def import_report() -> list:
+    """지연 import 된 모듈별 실제 import 시간 [(모듈, ms)] (오래 걸린 순)"""
+    return sorted(_timings.items(), key=lambda kv: kv[1], reverse=True)
@@ -0,0 +1,69 @@
+# ----------------------------------------------------------
+# 국가별 MBTI 16유형 비율 데이터 (Country + 16개 유형 열)
+# ----------------------------------------------------------
+
+import numpy as np
+import pandas as pd
+
+COUNTRY_COL = "Country"
+MBTI_COLUMNS = ['INFJ','ISFJ','ISTJ','INTJ','INFP','ISFP','ISTP','INTP',
+                'ENFJ','ESFJ','ESTJ','ENTJ','ENFP','ESFP','ESTP','ENTP']
+KOREA_NAMES = ["korea", "south korea", "republic of korea", "대한민국"]
+
+
+def to_typed(df: pd.DataFrame) -> pd.DataFrame:
+    """Country는 문자열, 존재하는 MBTI 열은 float로 변환 (없는 열은 그대로 둠)"""
+    if COUNTRY_COL not in df.columns:
+        raise ValueError(f"CSV에 '{COUNTRY_COL}' 컬럼이 없습니다. 파일을 확인하세요.")
+    df = df.copy()
+    df[COUNTRY_COL] = df[COUNTRY_COL].astype(str)
+    for c in df.columns:
+        if c.upper() in MBTI_COLUMNS:
+            df[c] = pd.to_numeric(df[c], errors="coerce").astype("float64")
+    return df
+
+
+def type_matrix(df: pd.DataFrame, types) -> tuple:
+    """(국가명 배열, 국가 × types 값 행렬). 열 이름은 대소문자 무시, 없는 열과 NaN은 0"""
+    by_upper = {str(c).upper(): c for c in df.columns}
+    matrix = np.zeros((len(df), len(types)))
+    for j, t in enumerate(types):
+        if t in by_upper:
+            matrix[:, j] = pd.to_numeric(df[by_upper[t]], errors="coerce").fillna(0).to_numpy()
+    return df[COUNTRY_COL].astype(str).to_numpy(), matrix
+
+
+class MbtiIndex:
+    """국가 → 행 위치, 유형별 내림차순 순위를 미리 만들어 둔 조회 인덱스
+
+    국가 선택은 dict 조회, 유형별 Top-k는 미리 argsort한 순위에서 앞 k개만 꺼낸다.
+    """
+
+    def __init__(self, plot_df: pd.DataFrame, types):
+        self.types = list(types)
+        self.type_pos = {t: i for i, t in enumerate(self.types)}
+        self.countries = plot_df[COUNTRY_COL].astype(str).to_numpy()
+        self.matrix = plot_df[self.types].to_numpy(dtype="float64")
+        # 같은 국가명이 여러 번 나오면 첫 번째 행을 쓴다
+        self.position = {}
+        for i, c in enumerate(self.countries):
+            self.position.setdefault(c, i)
+        # 차트에서 강조할 한국 행 (국가명 정규화는 여기서 한 번만)
+        self.is_korea = np.isin(np.char.lower(np.char.strip(self.countries.astype(str))), KOREA_NAMES)
+        # rankings[:, j] = j번째 유형 값이 큰 순서의 행 위치
+        self.rankings = np.argsort(-self.matrix, axis=0, kind="stable")
+
+    def row(self, country):
+        """국가의 유형별 값 배열 (없으면 None)"""
+        i = self.position.get(str(country))
+        return None if i is None else self.matrix[i]
+
+    def top(self, mbti: str, k: int = 10) -> pd.DataFrame:
+        """해당 유형 비율 상위 k개 국가 (Country, 유형 열, is_korea)"""
+        j = self.type_pos[mbti]
+        rows = self.rankings[:k, j]
+        return pd.DataFrame({
+            COUNTRY_COL: self.countries[rows],
+            mbti: self.matrix[rows, j],
+            "is_korea": self.is_korea[rows],
+        })
@@ -0,0 +1,111 @@
+# ----------------------------------------------------------
+# 국가 간 MBTI 분포 유사도 / 최근접 국가 / k-means 군집 (NumPy 일괄 계산)
+# ----------------------------------------------------------
+# 국가 × 16유형 행렬을 행마다 합이 1인 분포로 맞춘 뒤,
+# 행 블록 단위 행렬곱으로 모든 쌍의 유사도를 구하고 국가별 상위 k개만 보관한다.
+# (n × n 전체 행렬을 한 번에 만들지 않으므로 수천 개 행에서도 메모리가 블록 크기에 비례)
+
+import numpy as np
+import pandas as pd
+
+METRICS = ("cosine", "euclidean")
+
+
+def to_distribution(matrix: np.ndarray) -> np.ndarray:
+    """행 합이 1이 되도록 정규화 (비율/퍼센트 어느 쪽이든 같은 스케일로)"""
+    sums = matrix.sum(axis=1, keepdims=True)
+    return np.divide(matrix, sums, out=np.zeros_like(matrix, dtype="float64"), where=sums > 0)
+
+
+def topk_neighbors(matrix: np.ndarray, k: int = 10, metric: str = "cosine", block: int = 1024):
+    """모든 행에 대해 자기 자신을 뺀 가장 가까운 k개 행 (indices, scores)
+
+    cosine은 유사도(클수록 가까움), euclidean은 거리(작을수록 가까움)를 돌려준다.
+    """
+    n = len(matrix)
+    k = max(0, min(k, n - 1))
+    x = matrix.astype("float64")
+    if metric == "cosine":
+        norms = np.linalg.norm(x, axis=1, keepdims=True)
+        x = np.divide(x, norms, out=np.zeros_like(x), where=norms > 0)
+    sq = (x * x).sum(axis=1)
+
+    indices = np.empty((n, k), dtype=np.int64)
+    scores = np.empty((n, k), dtype="float64")
+    for start in range(0, n, block):
+        stop = min(start + block, n)
+        gram = x[start:stop] @ x.T
+        if metric == "cosine":
+            cost = -gram
+        else:
+            cost = sq[start:stop, None] + sq[None, :] - 2 * gram
+            np.maximum(cost, 0, out=cost)
+        rows = np.arange(stop - start)
+        cost[rows, rows + start] = np.inf  # 자기 자신 제외
+        if k == 0:
+            continue
+        part = np.argpartition(cost, k - 1, axis=1)[:, :k]
+        part_cost = np.take_along_axis(cost, part, axis=1)
+        order = np.argsort(part_cost, axis=1, kind="stable")
+        indices[start:stop] = np.take_along_axis(part, order, axis=1)
+        best = np.take_along_axis(part_cost, order, axis=1)
+        scores[start:stop] = -best if metric == "cosine" else np.sqrt(best)
+    return indices, scores
+
+
+def kmeans(matrix: np.ndarray, k: int, n_iter: int = 100, seed: int = 0):
+    """k-means++ 초기화 + Lloyd 반복 (labels, centers)"""
+    x = matrix.astype("float64")
+    n = len(x)
+    k = max(1, min(k, n))
+    rng = np.random.default_rng(seed)
+    centers = np.empty((k, x.shape[1]))
+    centers[0] = x[rng.integers(n)]
+    closest = ((x - centers[0]) ** 2).sum(axis=1)
+    for i in range(1, k):
+        total = closest.sum()
+        pick = rng.choice(n, p=closest / total) if total > 0 else rng.integers(n)
+        centers[i] = x[pick]
+        closest = np.minimum(closest, ((x - centers[i]) ** 2).sum(axis=1))
+
+    sq = (x * x).sum(axis=1)
+    labels = np.full(n, -1)
+    for _ in range(n_iter):
+        dist = sq[:, None] + (centers * centers).sum(axis=1)[None, :] - 2 * x @ centers.T
+        new_labels = dist.argmin(axis=1)
+        if np.array_equal(new_labels, labels):
+            break
+        labels = new_labels
+        counts = np.bincount(labels, minlength=k)
+        sums = np.zeros_like(centers)
+        np.add.at(sums, labels, x)
+        filled = counts > 0
+        centers[filled] = sums[filled] / counts[filled, None]
+    return labels, centers
+
+
+class SimilarityEngine:
+    """데이터셋 하나에 대한 최근접 국가 표와 군집 결과 (한 번 계산 후 조회)"""
+
+    def __init__(self, countries, matrix: np.ndarray, types, k: int = 10):
+        self.countries = np.asarray(countries)
+        self.types = list(types)
+        self.dist = to_distribution(np.asarray(matrix, dtype="float64"))
+        self.position = {}
+        for i, c in enumerate(self.countries):
+            self.position.setdefault(str(c), i)
+        self.neighbors_by_metric = {m: topk_neighbors(self.dist, k, m) for m in METRICS}
+        self._clusters = {}
+
+    def neighbors(self, country, metric: str = "cosine", k: int = 10) -> pd.DataFrame:
+        """해당 국가와 가장 비슷한 국가 k개 (국가, 점수)"""
+        i = self.position[str(country)]
+        idx, score = self.neighbors_by_metric[metric]
+        label = "코사인 유사도" if metric == "cosine" else "유클리드 거리"
+        return pd.DataFrame({"Country": self.countries[idx[i, :k]], label: score[i, :k]})
+
+    def clusters(self, k: int):
+        """k개 군집의 (labels, centers) - k별로 한 번만 계산"""
+        if k not in self._clusters:
+            self._clusters[k] = kmeans(self.dist, k)
+        return self._clusters[k]
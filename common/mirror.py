@@ -0,0 +1,143 @@
+# ----------------------------------------------------------
+# 원격 CSV 로컬 미러 (조건부 재검증 + 오프라인 대비)
+# ----------------------------------------------------------
+# URL 내용을 .cache/mirror 아래에 저장해 두고,
+# - max_age 안에는 네트워크 없이 로컬 사본을 그대로 쓰고
+# - 그 뒤에는 ETag / Last-Modified로 조건부 요청(304면 다운로드 생략)을 보내며
+# - 네트워크가 안 되거나 서버가 오류를 돌려주면 마지막으로 받은 사본을 쓴다.
+#   실패한 시각은 메타데이터에 남겨 두고, 실패가 이어질수록 길어지는 대기 시간
+#   (FAIL_BACKOFF초부터 두 배씩, 최대 FAIL_BACKOFF_MAX초) 동안은 다시 연결을 시도하지 않는다.
+#   (안 그러면 재실행마다 timeout만큼 URL 잠금을 잡고 기다리고, 다른 세션은 그 뒤에 줄을 선다)
+# 같은 URL을 여러 세션이 동시에 요청해도 실제 다운로드는 한 번만 일어난다.
+
+import hashlib
+import json
+import os
+import threading
+import time
+import urllib.error
+import urllib.request
+from collections import namedtuple
+from pathlib import Path
+
+from common.columnar_cache import CACHE_DIR
+
+MIRROR_DIR = CACHE_DIR / "mirror"
+FAIL_BACKOFF = 30
+FAIL_BACKOFF_MAX = 600
+
+# path: 로컬 사본 경로 / version: 내용 해시
+# status: cached, not-modified, updated, offline(연결 실패), server-error(304가 아닌 HTTP 오류)
+# detail: offline / server-error일 때 실패 내용 (예: "HTTP 500 Internal Server Error")
+MirrorResult = namedtuple("MirrorResult", ["path", "version", "status", "detail"], defaults=[None])
+
+_locks = {}
+_locks_guard = threading.Lock()
+
+
+def _lock_for(url: str) -> threading.Lock:
+    with _locks_guard:
+        return _locks.setdefault(url, threading.Lock())
+
+
+def _paths(url: str):
+    key = hashlib.sha1(url.encode("utf-8")).hexdigest()[:16]
+    suffix = Path(url.split("?", 1)[0]).suffix or ".bin"
+    return MIRROR_DIR / f"{key}{suffix}", MIRROR_DIR / f"{key}.json"
+
+
+def _read_meta(meta_path: Path) -> dict:
+    try:
+        return json.loads(meta_path.read_text(encoding="utf-8"))
+    except (OSError, ValueError):
+        return {}
+
+
+def _write_meta(meta_path: Path, meta: dict):
+    MIRROR_DIR.mkdir(parents=True, exist_ok=True)
+    tmp = meta_path.with_suffix(f".{os.getpid()}.tmp")
+    tmp.write_text(json.dumps(meta, ensure_ascii=False), encoding="utf-8")
+    os.replace(tmp, meta_path)
+
+
+def _backoff(meta: dict) -> float:
+    """직전 실패 뒤 다시 시도하기까지 기다릴 초 (실패 기록이 없으면 0)"""
+    fails = meta.get("fail_count", 0)
+    if not fails:
+        return 0
+    return min(FAIL_BACKOFF_MAX, FAIL_BACKOFF * 2 ** (fails - 1))
+
+
+def _record_failure(meta_path: Path, meta: dict, status: str, detail: str):
+    meta = dict(meta)
+    meta.update(
+        failed_at=time.time(), fail_count=meta.get("fail_count", 0) + 1,
+        fail_status=status, fail_detail=detail,
+    )
+    try:
+        _write_meta(meta_path, meta)
+    except OSError:
+        pass  # 기록 실패가 사본 사용을 막지 않도록 무시
+
+
+def fetch_mirrored(url: str, max_age: float = 60, timeout: float = 10) -> MirrorResult:
+    """URL의 로컬 사본을 최신으로 맞춘 뒤 (경로, 버전, 상태, 실패 내용) 반환
+
+    사본이 없고 네트워크도 안 되면 원래 예외(URLError 등)를 그대로 올린다.
+    직전 실패 뒤 대기 시간이 지나지 않았으면 네트워크를 쓰지 않고 사본(없으면 ConnectionError)을 돌려준다.
+    """
+    data_path, meta_path = _paths(url)
+    with _lock_for(url):
+        meta = _read_meta(meta_path)
+        have_copy = data_path.exists() and "sha1" in meta
+        if have_copy and time.time() - meta.get("checked_at", 0) < max_age:
+            return MirrorResult(data_path, meta["sha1"], "cached")
+        wait = meta.get("failed_at", 0) + _backoff(meta) - time.time()
+        if wait > 0:
+            if have_copy:
+                return MirrorResult(data_path, meta["sha1"], meta.get("fail_status", "offline"), meta.get("fail_detail"))
+            raise ConnectionError(f"{meta.get('fail_detail')} (약 {wait:.0f}초 뒤 다시 시도합니다)")
+
+        req = urllib.request.Request(url)
+        if have_copy:
+            if meta.get("etag"):
+                req.add_header("If-None-Match", meta["etag"])
+            if meta.get("last_modified"):
+                req.add_header("If-Modified-Since", meta["last_modified"])
+
+        try:
+            with urllib.request.urlopen(req, timeout=timeout) as resp:
+                body = resp.read()
+                headers = resp.headers
+        except urllib.error.HTTPError as e:
+            if e.code == 304 and have_copy:
+                for key in ("failed_at", "fail_count", "fail_status", "fail_detail"):
+                    meta.pop(key, None)
+                meta["checked_at"] = time.time()
+                _write_meta(meta_path, meta)
+                return MirrorResult(data_path, meta["sha1"], "not-modified")
+            detail = f"HTTP {e.code} {e.reason}"
+            _record_failure(meta_path, meta, "server-error", detail)
+            if have_copy:
+                return MirrorResult(data_path, meta["sha1"], "server-error", detail)
+            raise
+        except (urllib.error.URLError, OSError) as e:
+            detail = str(getattr(e, "reason", e))
+            _record_failure(meta_path, meta, "offline", detail)
+            if have_copy:
+                return MirrorResult(data_path, meta["sha1"], "offline", detail)
+            raise
+
+        MIRROR_DIR.mkdir(parents=True, exist_ok=True)
+        tmp = data_path.with_suffix(f".{os.getpid()}.tmp")
+        tmp.write_bytes(body)
+        os.replace(tmp, data_path)
+        meta = {
+            "url": url,
+            "etag": headers.get("ETag"),
+            "last_modified": headers.get("Last-Modified"),
+            "sha1": hashlib.sha1(body).hexdigest()[:16],
+            "checked_at": time.time(),
+        }
+        _write_meta(meta_path, meta)
+        return MirrorResult(data_path, meta["sha1"], "updated")
@@ -0,0 +1,51 @@
+# ----------------------------------------------------------
+# 차트 색상 팔레트 (NumPy로 한 번에 생성 + (n, 색상) 조합별 메모이즈)
+# ----------------------------------------------------------
+# 막대마다 hex 문자열을 파싱/보간하지 않도록, 같은 요청에는 만들어 둔 튜플을 그대로 돌려준다.
+
+from functools import lru_cache
+
+import numpy as np
+
+RED = '#E63946'
+DEEP_BLUE = '#0d6efd'
+LIGHT_BLUE = '#e7f0ff'
+HIGHLIGHT_BLUE = '#4dabf7'
+
+
+def _hex_to_array(hex_color: str) -> np.ndarray:
+    h = hex_color.lstrip('#')
+    return np.array([int(h[i:i+2], 16) for i in (0, 2, 4)], dtype="float64")
+
+
+@lru_cache(maxsize=256)
+def gradient(n: int, start: str, end: str) -> tuple:
+    """start → end 로 n단계 hex 그라데이션 (양 끝 포함, 채널 값은 버림)"""
+    if n <= 0:
+        return ()
+    t = np.linspace(0.0, 1.0, n) if n > 1 else np.zeros(1)
+    c1, c2 = _hex_to_array(start), _hex_to_array(end)
+    rgb = np.trunc(c1 + (c2 - c1) * t[:, None]).astype(int)
+    return tuple('#%02x%02x%02x' % tuple(c) for c in rgb)
+
+
+@lru_cache(maxsize=256)
+def rank_colors(n: int, first: str = RED, start: str = DEEP_BLUE, end: str = LIGHT_BLUE) -> tuple:
+    """1위는 first, 2위부터는 start → end 그라데이션"""
+    if n <= 0:
+        return ()
+    return (first,) + gradient(n - 1, start, end)
+
+
+@lru_cache(maxsize=256)
+def alpha_ramp(n: int, rgb=(0, 0, 255), high: float = 0.9, low: float = 0.3, first: str = "red") -> tuple:
+    """1위는 first, 나머지 n-1개는 같은 색의 투명도를 high → low 로 낮춘 rgba"""
+    if n <= 0:
+        return ()
+    r, g, b = rgb
+    return (first,) + tuple(f"rgba({r},{g},{b},{alpha})" for alpha in np.linspace(high, low, n - 1))
+
+
+def two_tone(mask, on: str = RED, off: str = HIGHLIGHT_BLUE) -> list:
+    """불리언 배열 → 강조색/기본색 목록"""
+    return np.where(np.asarray(mask, dtype=bool), on, off).tolist()
@@ -0,0 +1,164 @@
+# ----------------------------------------------------------
+# 페이지 성능 측정 (선택 사항, 기본은 꺼짐)
+# ----------------------------------------------------------
+# 각 페이지의 로드 / 필터 / 집계 / 차트 단계를 stage()로 감싸 두면, 측정이 켜진
+# 재실행에서 단계별 경과 시간, 처리한 행 수, 메모리(RSS) 변화를 기록한다.
+# - 사이드바 "⏱ 성능 측정" 체크박스 또는 환경변수 APP_PERF=1 로 켠다.
+# - 기록은 사이드바 패널에 표로 보여 주고 .cache/perf.jsonl 에 한 줄씩 덧붙인다
+#   (경로는 환경변수 PERF_LOG 로 바꿀 수 있음).
+# - 단계 종류(kind)별 합계를 보면 파싱/집계/렌더링 중 어디가 느린지 바로 보인다.
+#   (common.lazy로 지연 import 된 라이브러리는 "import" 단계로 자동 기록된다)
+# 꺼져 있을 때 stage()는 아무 것도 측정하지 않는다.
+
+import functools
+import json
+import os
+import threading
+import time
+import uuid
+from contextlib import contextmanager
+from pathlib import Path
+
+import streamlit as st
+
+KINDS = ["import", "load", "filter", "aggregate", "chart"]
+LOG_PATH = Path(os.environ.get("PERF_LOG") or Path(__file__).resolve().parent.parent / ".cache" / "perf.jsonl")
+
+_STATE_KEY = "_perf_run"
+_log_lock = threading.Lock()
+try:
+    _PAGE_SIZE = os.sysconf("SC_PAGE_SIZE")
+except (AttributeError, ValueError, OSError):
+    _PAGE_SIZE = 4096
+
+
+def rss_bytes():
+    """현재 프로세스의 상주 메모리(RSS). /proc가 없는 환경에서는 None"""
+    try:
+        with open("/proc/self/statm") as f:
+            return int(f.read().split()[1]) * _PAGE_SIZE
+    except (OSError, ValueError, IndexError):
+        return None
+
+
+class StageRecord:
+    """한 단계의 측정 결과. with 블록 안에서 rows를 채워 넣을 수 있다"""
+
+    __slots__ = ("kind", "name", "rows", "ms", "child_ms", "rss_delta", "rss")
+
+    def __init__(self, kind: str, name: str, rows=None):
+        self.kind = kind
+        self.name = name
+        self.rows = rows
+        self.ms = 0.0
+        self.child_ms = 0.0  # 안쪽에 중첩된 단계(예: 차트 안의 import) 시간
+        self.rss_delta = None
+        self.rss = None
+
+    def as_dict(self) -> dict:
+        return {
+            "kind": self.kind, "stage": self.name, "ms": round(self.ms, 3),
+            "self_ms": round(self.ms - self.child_ms, 3),
+            "rows": None if self.rows is None else int(self.rows),
+            "rss_delta_mb": None if self.rss_delta is None else round(self.rss_delta / 2**20, 3),
+            "rss_mb": None if self.rss is None else round(self.rss / 2**20, 1),
+        }
+
+
+def _current_run():
+    try:
+        return st.session_state.get(_STATE_KEY)
+    except Exception:
+        return None
+
+
+def start_run(page: str) -> bool:
+    """재실행 시작: 사이드바 토글을 그리고 이번 실행의 기록을 비운다. 측정 여부를 반환"""
+    enabled = st.sidebar.checkbox(
+        "⏱ 성능 측정", value=os.environ.get("APP_PERF", "") not in ("", "0"), key="perf_enabled",
+        help=f"단계별 시간/행 수/메모리 변화를 사이드바에 표시하고 {LOG_PATH.name}에 기록합니다.",
+    )
+    st.session_state[_STATE_KEY] = {
+        "page": page, "run": uuid.uuid4().hex[:12], "records": [], "stack": [], "started": time.perf_counter(),
+    } if enabled else None
+    return enabled
+
+
+@contextmanager
+def stage(kind: str, name: str, rows=None):
+    """단계 하나를 측정 (측정이 꺼져 있으면 그대로 통과)
+
+    with stage("aggregate", "국가별 합계") as rec:
+        ...
+        rec.rows = len(df)
+    """
+    run = _current_run()
+    rec = StageRecord(kind, name, rows)
+    if run is None:
+        yield rec
+        return
+    rss0 = rss_bytes()
+    run["stack"].append(rec)
+    t0 = time.perf_counter()
+    try:
+        yield rec
+    finally:
+        rec.ms = (time.perf_counter() - t0) * 1000
+        run["stack"].pop()
+        if run["stack"]:
+            run["stack"][-1].child_ms += rec.ms
+        rec.rss = rss_bytes()
+        if rss0 is not None and rec.rss is not None:
+            rec.rss_delta = rec.rss - rss0
+        run["records"].append(rec)
+        _append_log(run, rec)
+
+
+def timed(kind: str, name=None, rows=len):
+    """함수 전체를 stage()로 감싸는 데코레이터. rows(결과)로 처리 행 수를 기록"""
+    def decorator(func):
+        label = name or func.__name__
+
+        @functools.wraps(func)
+        def wrapper(*args, **kwargs):
+            with stage(kind, label) as rec:
+                result = func(*args, **kwargs)
+                if rows is not None:
+                    try:
+                        rec.rows = rows(result)
+                    except TypeError:
+                        pass
+                return result
+        return wrapper
+    return decorator
+
+
+def _append_log(run: dict, rec: StageRecord):
+    entry = {"ts": round(time.time(), 3), "page": run["page"], "run": run["run"], **rec.as_dict()}
+    line = json.dumps(entry, ensure_ascii=False) + "\n"
+    try:
+        with _log_lock:
+            LOG_PATH.parent.mkdir(parents=True, exist_ok=True)
+            with open(LOG_PATH, "a", encoding="utf-8") as f:
+                f.write(line)
+    except OSError:
+        pass  # 기록 실패가 페이지를 막지 않도록 무시
+
+
+def show_panel():
+    """이번 재실행의 단계별 기록과 종류별 합계를 사이드바에 표시 (페이지 맨 끝에서 호출)"""
+    run = _current_run()
+    if run is None:
+        return
+    records = run["records"]
+    total_ms = (time.perf_counter() - run["started"]) * 1000
+    with st.sidebar.expander("⏱ 성능 측정 결과", expanded=True):
+        # 중첩된 단계가 두 번 더해지지 않도록 종류별 합계는 자기 시간(self_ms)으로 계산
+        by_kind = {k: sum(r.ms - r.child_ms for r in records if r.kind == k) for k in KINDS}
+        measured = sum(by_kind.values())
+        st.caption(f"전체 {total_ms:,.0f} ms · 측정된 단계 {measured:,.0f} ms · 기타 {max(total_ms - measured, 0):,.0f} ms")
+        if measured > 0:
+            slowest = max(by_kind, key=by_kind.get)
+            st.write(" · ".join(f"**{k}** {v:,.0f} ms" for k, v in by_kind.items() if v > 0))
+            st.caption(f"가장 오래 걸린 단계 종류: {slowest}")
+        st.dataframe([r.as_dict() for r in records], use_container_width=True, hide_index=True)
@@ -0,0 +1,83 @@
+# ----------------------------------------------------------
+# MBTI 추천 카탈로그 (00 진로, 01 영화·책 페이지)
+# ----------------------------------------------------------
+# 추천 항목은 페이지 코드에 dict로 박아 두지 않고 data/mbti_recommendations.json 에서 읽는다.
+# 파일 형식: [{"id", "type", "category", "title", "desc"}, ...]
+#   category: career(진로) / movie(영화) / book(책), desc는 생략 가능
+#   features(선택): E/I, N/S, T/F, J/P 네 축 값(-1~1) — common.recommender에서 사용
+# 읽을 때 (유형, 분류) → 항목 위치 인덱스를 한 번 만들어 두므로 유형마다 항목이 수천 개여도
+# 페이지 넘기기는 슬라이스, 무작위 추천은 인덱스에서 뽑기만 한다.
+
+import json
+import random
+
+MBTI_TYPES = [
+    "INTJ", "INTP", "ENTJ", "ENTP",
+    "INFJ", "INFP", "ENFJ", "ENFP",
+    "ISTJ", "ISFJ", "ESTJ", "ESFJ",
+    "ISTP", "ISFP", "ESTP", "ESFP",
+]
+CATEGORIES = ["career", "movie", "book"]
+REQUIRED_KEYS = ["type", "category", "title"]
+
+TYPE_EMOJI = {
+    "INTJ": "🧭", "INTP": "🔬", "ENTJ": "🚀", "ENTP": "💡",
+    "INFJ": "🕯️", "INFP": "🌙", "ENFJ": "🌱", "ENFP": "🎈",
+    "ISTJ": "📜", "ISFJ": "🧶", "ESTJ": "🛡️", "ESFJ": "🤝",
+    "ISTP": "🔧", "ISFP": "🎨", "ESTP": "⚡", "ESFP": "✨",
+}
+
+
+def emoji_for_mbti(code) -> str:
+    """MBTI 유형에 어울리는 이모지 (모르는 유형은 ✨)"""
+    return TYPE_EMOJI.get(code, "✨")
+
+
+def load_catalogue(path) -> "Catalogue":
+    """JSON 파일에서 추천 항목을 읽고 필수 키/유형/분류를 검사한 뒤 인덱스를 만든다"""
+    with open(path, encoding="utf-8") as f:
+        raw = json.load(f)
+    items = []
+    for i, item in enumerate(raw):
+        missing = [k for k in REQUIRED_KEYS if k not in item]
+        if missing:
+            raise ValueError(f"{i}번째 추천 항목에 필수 항목이 없습니다: {missing}")
+        entry = dict(item)
+        entry["type"] = str(item["type"]).upper()
+        if entry["type"] not in TYPE_EMOJI:
+            raise ValueError(f"{i}번째 추천 항목의 MBTI 유형을 알 수 없습니다: {item['type']}")
+        if entry["category"] not in CATEGORIES:
+            raise ValueError(f"{i}번째 추천 항목의 분류는 {CATEGORIES} 중 하나여야 합니다: {item['category']}")
+        entry["id"] = str(item.get("id", i))
+        entry.setdefault("desc", "")
+        items.append(entry)
+    return Catalogue(items)
+
+
+class Catalogue:
+    """추천 항목 목록 + (유형, 분류) → 항목 위치 인덱스 (파일 순서 유지)"""
+
+    def __init__(self, items: list):
+        self.items = items
+        self.index = {}
+        for i, item in enumerate(items):
+            self.index.setdefault((item["type"], item["category"]), []).append(i)
+        self.index = {key: tuple(pos) for key, pos in self.index.items()}
+
+    def __len__(self):
+        return len(self.items)
+
+    def count(self, mbti: str, category: str) -> int:
+        return len(self.index.get((mbti, category), ()))
+
+    def page(self, mbti: str, category: str, page: int = 1, per_page: int = 10) -> list:
+        """page번째(1부터) 페이지의 항목들"""
+        pos = self.index.get((mbti, category), ())
+        start = (max(page, 1) - 1) * per_page
+        return [self.items[i] for i in pos[start:start + per_page]]
+
+    def sample(self, mbti: str, category: str, n: int, seed=None) -> list:
+        """무작위 n개 (seed가 같으면 같은 결과, 파일 순서대로 정렬해서 반환)"""
+        pos = self.index.get((mbti, category), ())
+        picked = random.Random(seed).sample(range(len(pos)), min(n, len(pos)))
+        return [self.items[pos[i]] for i in sorted(picked)]
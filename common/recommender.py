@@ -0,0 +1,155 @@
+# ----------------------------------------------------------
+# 유형 벡터 기반 추천 (01 페이지 "섞어서 추천받기")
+# ----------------------------------------------------------
+# MBTI 유형을 네 축(E/I, N/S, T/F, J/P)의 ±1 벡터로, 카탈로그 항목을 같은 네 축의
+# 특징 벡터로 나타내고 내적으로 점수를 매긴다.
+# - 항목 특징: JSON의 "features"(네 축 값, -1~1)가 있으면 그 값, 없으면 항목 유형의 벡터
+# - 분류마다 (항목 × 16유형) 점수 행렬을 한 번만 계산해 둔다. 점수는 유형 벡터에 선형이므로
+#   여러 유형을 섞은 점수는 이 행렬과 가중치 벡터(16개)의 곱 한 번이다.
+# - 상위 k개는 argpartition으로 고른 뒤 그 k개만 정렬한다 (항목 10만 개도 수 ms)
+# - 나라별 추천: (국가 × 16유형 분포) @ (16유형 × 항목 점수)를 항목 블록마다 한 번에 계산하고
+#   국가별 상위 k개만 남긴다. 모든 나라의 결과가 한 표로 나오므로 그대로 내보낼 수 있다.
+
+import threading
+
+import numpy as np
+
+from common.lazy import lazy_import
+from common.recommendations import MBTI_TYPES
+
+pd = lazy_import("pandas")  # 나라별 추천 표를 만들 때만 필요
+
+AXES = ["EI", "NS", "TF", "JP"]  # 앞 글자 +1, 뒤 글자 -1
+
+
+def type_vector(code: str) -> np.ndarray:
+    """"INTJ" → [-1, +1, +1, +1]"""
+    code = code.upper()
+    if len(code) != 4 or any(c not in axis for c, axis in zip(code, AXES)):
+        raise ValueError(f"MBTI 유형을 알 수 없습니다: {code}")
+    return np.array([1.0 if c == axis[0] else -1.0 for c, axis in zip(code, AXES)])
+
+
+TYPE_MATRIX = np.stack([type_vector(t) for t in MBTI_TYPES])  # 16 × 4
+TYPE_POS = {t: i for i, t in enumerate(MBTI_TYPES)}
+
+
+def item_features(items: list) -> np.ndarray:
+    """항목들의 특징 행렬 (항목 수 × 4). features가 없는 항목은 유형 벡터"""
+    out = TYPE_MATRIX[[TYPE_POS[item["type"]] for item in items]].reshape(-1, len(AXES))
+    given = [i for i, item in enumerate(items) if item.get("features") is not None]
+    if given:
+        try:
+            values = np.array([items[i]["features"] for i in given], dtype="float64")
+        except ValueError:
+            values = None
+        if values is None or values.shape != (len(given), len(AXES)):
+            raise ValueError(f"추천 항목의 features는 모두 숫자 {len(AXES)}개여야 합니다.")
+        out[given] = np.clip(values, -1.0, 1.0)
+    return out
+
+
+def blend_weights(blend: dict) -> np.ndarray:
+    """{"INTJ": 0.8, "ENFP": 0.2} → 합이 1인 16개 가중치"""
+    weights = np.zeros(len(MBTI_TYPES))
+    for code, w in blend.items():
+        if code.upper() not in TYPE_POS:
+            raise ValueError(f"MBTI 유형을 알 수 없습니다: {code}")
+        weights[TYPE_POS[code.upper()]] += max(float(w), 0.0)
+    total = weights.sum()
+    if total <= 0:
+        raise ValueError("섞을 유형의 가중치가 모두 0입니다.")
+    return weights / total
+
+
+def top_k(scores: np.ndarray, k: int) -> np.ndarray:
+    """점수 상위 k개 위치 (점수 내림차순, 같은 점수는 앞 위치 먼저)"""
+    k = min(k, len(scores))
+    if k <= 0:
+        return np.array([], dtype=np.int64)
+    # argpartition으로 k번째 점수만 찾고, 그보다 큰 것 + 같은 것 중 앞쪽만 남긴다
+    kth = scores[np.argpartition(-scores, k - 1)[k - 1]]
+    above = np.flatnonzero(scores > kth)
+    tied = np.flatnonzero(scores == kth)[:k - len(above)]
+    head = np.concatenate([above, tied])
+    return head[np.lexsort((head, -scores[head]))]
+
+
+def weighted_top_k(weights: np.ndarray, scores: np.ndarray, k: int, block: int = 8192):
+    """weights(행 × 16) @ scores(항목 × 16).T 의 행별 상위 k개 (위치, 점수), 점수 내림차순
+
+    항목을 block개씩 나눠 행렬곱 한 번씩 하고, 지금까지의 상위 k개와 합쳐 다시 k개만 남긴다.
+    (행 × 전체 항목 행렬을 한꺼번에 만들지 않으므로 메모리는 행 수 × block에 비례)
+    같은 점수는 top_k와 같은 규칙(앞 위치 먼저)으로 고르므로 행마다 top_k(weights[i] @ scores.T, k)와 같다.
+    """
+    rows, n = len(weights), len(scores)
+    k = min(k, n)
+    # 후보는 항상 위치 오름차순으로 유지한다 (이전 상위 k개는 모두 새 블록보다 앞 위치)
+    best_idx = np.empty((rows, 0), dtype=np.int64)
+    best_val = np.empty((rows, 0), dtype="float32")
+    weights = weights.astype("float32")
+    for start in range(0, n, block):
+        part = weights @ scores[start:start + block].T
+        cand_idx = np.concatenate([best_idx, np.broadcast_to(np.arange(start, start + part.shape[1]), part.shape)], axis=1)
+        cand_val = np.concatenate([best_val, part], axis=1)
+        width = cand_val.shape[1]
+        if width > k:
+            # k번째 점수보다 큰 것은 모두, 같은 것은 앞 위치부터 모자란 만큼만
+            kth = np.partition(cand_val, width - k, axis=1)[:, width - k, None]
+            above = cand_val > kth
+            tied = cand_val == kth
+            need = k - above.sum(axis=1, keepdims=True)
+            keep = above | (tied & (np.cumsum(tied, axis=1) <= need))
+            cand_idx = cand_idx[keep].reshape(rows, k)
+            cand_val = cand_val[keep].reshape(rows, k)
+        best_idx, best_val = cand_idx, cand_val
+    order = np.lexsort((best_idx, -best_val), axis=1)
+    return np.take_along_axis(best_idx, order, axis=1), np.take_along_axis(best_val, order, axis=1)
+
+
+class Recommender:
+    """카탈로그 분류별 (항목 × 16유형) 점수 행렬을 지연 계산해 두고 조회"""
+
+    def __init__(self, catalogue):
+        self.catalogue = catalogue
+        self._scores = {}  # category → (항목 위치 배열, 점수 행렬 float32)
+        self._lock = threading.Lock()
+
+    def type_scores(self, category: str):
+        """분류의 (항목 위치, 항목 × 16유형 점수). 점수 범위는 -1~1"""
+        cached = self._scores.get(category)
+        if cached is not None:
+            return cached
+        with self._lock:
+            cached = self._scores.get(category)
+            if cached is None:
+                items = self.catalogue.items
+                pos = np.array([i for i, item in enumerate(items) if item["category"] == category], dtype=np.int64)
+                features = item_features([items[i] for i in pos])
+                scores = (features @ TYPE_MATRIX.T / len(AXES)).astype("float32")
+                cached = self._scores[category] = (pos, scores)
+        return cached
+
+    def recommend(self, blend: dict, category: str, k: int = 10) -> list:
+        """섞은 유형에 대한 상위 k개 [(항목, 점수)]"""
+        pos, scores = self.type_scores(category)
+        blended = scores @ blend_weights(blend).astype("float32")
+        best = top_k(blended, k)
+        return [(self.catalogue.items[pos[i]], float(blended[i])) for i in best]
+
+    def country_table(self, countries, distribution: np.ndarray, category: str, k: int = 10) -> "pd.DataFrame":
+        """모든 나라의 상위 k개 추천 표 (Country, 순위, 제목, 유형, 어울림)
+
+        distribution: 국가 × 16유형(MBTI_TYPES 순서) 분포, 행 합이 1
+        """
+        pos, scores = self.type_scores(category)
+        idx, val = weighted_top_k(distribution, scores, k)
+        items = self.catalogue.items
+        flat = pos[idx.ravel()]
+        return pd.DataFrame({
+            "Country": np.repeat(np.asarray(countries, dtype=object), idx.shape[1]),
+            "순위": np.tile(np.arange(1, idx.shape[1] + 1), len(idx)),
+            "제목": [items[i]["title"] for i in flat],
+            "유형": [items[i]["type"] for i in flat],
+            "어울림": ((val.ravel() + 1) / 2).round(4),
+        })
@@ -0,0 +1,69 @@
+# ----------------------------------------------------------
+# 관광지 ↔ 가까운 지하철역 ↔ 역별 일평균 승하차 (02 페이지)
+# ----------------------------------------------------------
+# 관광지마다 가까운 역 k개를 거리 행렬(브로드캐스트 haversine) 한 번으로 구하고,
+# 04 페이지 데이터(지하철 승하차)를 역명별 일평균으로 미리 집계해 붙인 표를 만든다.
+# 표는 세 데이터 파일의 버전으로 만든 키로 .cache/ 에 Parquet으로 저장되므로
+# 파일이 바뀌지 않는 한 승하차 프레임을 다시 훑지 않는다.
+# 열: spot_id, 순위, 역명, 거리_km, 일평균승차, 일평균하차, 일평균합계, 집계일수
+
+import hashlib
+
+import numpy as np
+import pandas as pd
+
+from common.columnar_cache import cached_build
+from common.geo import nearest_pairs
+from common.subway import STATION_COL, station_daily_means
+
+NEAREST_STATIONS = 3
+TRAFFIC_COLUMNS = ["일평균승차", "일평균하차", "일평균합계", "집계일수"]
+
+
+def nearest_station_frame(spots: list, stations: list, k: int = NEAREST_STATIONS) -> pd.DataFrame:
+    """관광지별 가까운 역 k개 (spot_id, 순위, 역명, 거리_km)"""
+    idx, dist = nearest_pairs(
+        [s["lat"] for s in spots], [s["lon"] for s in spots],
+        [s["lat"] for s in stations], [s["lon"] for s in stations], k=k,
+    )
+    names = np.array([s["name"] for s in stations], dtype=object)
+    n, k = idx.shape
+    return pd.DataFrame({
+        "spot_id": np.array([s["id"] for s in spots], dtype=object).repeat(k),
+        "순위": np.tile(np.arange(1, k + 1, dtype="int32"), n),
+        STATION_COL: names[idx.ravel()],
+        "거리_km": dist.ravel(),
+    })
+
+
+def build_spot_traffic(spots: list, stations: list, subway_df, k: int = NEAREST_STATIONS) -> pd.DataFrame:
+    """가까운 역 표에 역명별 일평균 승하차를 붙인 표 (승하차 데이터가 없으면 빈 값)"""
+    near = nearest_station_frame(spots, stations, k)
+    if subway_df is None:
+        traffic = pd.DataFrame(columns=[STATION_COL] + TRAFFIC_COLUMNS)
+    else:
+        traffic = station_daily_means(subway_df)
+    out = near.merge(traffic, on=STATION_COL, how="left")
+    out[TRAFFIC_COLUMNS] = out[TRAFFIC_COLUMNS].astype("float64")
+    return out
+
+
+def spot_traffic_version(*versions) -> str:
+    """관광지/역 좌표/승하차 파일 버전을 합친 캐시 키 (승하차가 없으면 None을 넘긴다)"""
+    raw = "|".join(str(v) for v in versions)
+    return hashlib.sha1(raw.encode("utf-8")).hexdigest()[:16]
+
+
+def load_spot_traffic(version: str, build) -> pd.DataFrame:
+    """Parquet 캐시에서 표를 읽고, 없으면 build()로 한 번만 만든다"""
+    return cached_build("spot-traffic", version, build)
+
+
+def traffic_by_spot(table: pd.DataFrame) -> dict:
+    """spot_id → 가까운 역 레코드 목록 (클릭 때 딕셔너리 조회 한 번, 승하차가 없으면 None)"""
+    table = table.sort_values(["spot_id", "순위"], kind="stable")
+    records = table.astype(object).where(table.notna(), None).to_dict("records")
+    out = {}
+    for r in records:
+        out.setdefault(r["spot_id"], []).append(r)
+    return out
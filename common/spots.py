@@ -0,0 +1,105 @@
+# ----------------------------------------------------------
+# 관광지(POI) 목록과 조회 인덱스 (02 페이지)
+# ----------------------------------------------------------
+# 관광지는 코드에 박아 두지 않고 data/seoul_spots.json 에서 읽는다 (수백~수천 개도 가능).
+# 파일 형식: [{"id", "name", "lat", "lon", "desc"}, ...]  (id가 없으면 순번)
+# 지하철역 좌표(data/subway_stations.csv: 역명,lat,lon)와 합친 PoiStore는
+# - 격자 인덱스로 화면 범위 안의 점 / 클릭한 곳에서 가까운 점을 찾고
+# - 마커 클릭 결과(좌표)로 점을 찾을 때 목록을 훑지 않고 좌표 딕셔너리에서 바로 꺼낸다.
+
+import csv
+import json
+
+import numpy as np
+
+from common.geo import GridIndex
+
+REQUIRED_KEYS = ["name", "lat", "lon"]
+COORD_DIGITS = 6  # 좌표 키 반올림 자릿수 (약 0.1m)
+
+
+def load_spots(path) -> list:
+    """JSON 파일에서 관광지 목록을 읽고 필수 키와 좌표 타입을 검사"""
+    with open(path, encoding="utf-8") as f:
+        raw = json.load(f)
+    spots = []
+    for i, item in enumerate(raw):
+        missing = [k for k in REQUIRED_KEYS if k not in item]
+        if missing:
+            raise ValueError(f"{i}번째 관광지에 필수 항목이 없습니다: {missing}")
+        spot = dict(item)
+        spot["id"] = str(item.get("id", i))
+        spot["lat"] = float(item["lat"])
+        spot["lon"] = float(item["lon"])
+        spot.setdefault("desc", "")
+        spots.append(spot)
+    return spots
+
+
+def load_stations(path) -> list:
+    """지하철역 좌표 CSV (역명,lat,lon, UTF-8) → [{"id", "name", "lat", "lon"}]"""
+    with open(path, encoding="utf-8-sig", newline="") as f:
+        rows = list(csv.DictReader(f))
+    stations = []
+    for i, row in enumerate(rows):
+        try:
+            lat, lon = float(row["lat"]), float(row["lon"])
+        except (KeyError, TypeError, ValueError):
+            raise ValueError(f"{i + 2}번째 줄의 역명/lat/lon 값을 읽을 수 없습니다: {row}")
+        stations.append({"id": f"station:{row['역명']}", "name": row["역명"], "lat": lat, "lon": lon})
+    return stations
+
+
+def coord_key(lat, lon) -> tuple:
+    return round(float(lat), COORD_DIGITS), round(float(lon), COORD_DIGITS)
+
+
+SPOT = "spot"
+STATION = "station"
+
+
+class PoiStore:
+    """관광지 + 지하철역을 한 좌표 배열로 묶고 격자 인덱스를 붙인 저장소
+
+    - kinds / names / lats / lons: 점 위치 순서의 배열
+    - items[i]: 원래 dict (관광지는 desc 포함)
+    """
+
+    def __init__(self, spots: list, stations: list = ()):
+        self.items = list(spots) + list(stations)
+        self.kinds = np.array([SPOT] * len(spots) + [STATION] * len(stations), dtype=object)
+        self.names = np.array([p["name"] for p in self.items], dtype=object)
+        self.lats = np.array([p["lat"] for p in self.items], dtype="float64")
+        self.lons = np.array([p["lon"] for p in self.items], dtype="float64")
+        self.grid = GridIndex(self.lats, self.lons)
+        self.by_coord = {coord_key(p["lat"], p["lon"]): i for i, p in enumerate(self.items)}
+
+    def __len__(self):
+        return len(self.items)
+
+    def in_view(self, bounds, kinds=(SPOT, STATION), limit=None) -> np.ndarray:
+        """st_folium bounds({"_southWest", "_northEast"}) 안의 점 위치
+
+        limit을 넘으면 관광지를 먼저, 그다음 역을 앞에서부터 limit개만 돌려준다.
+        """
+        sw, ne = bounds["_southWest"], bounds["_northEast"]
+        idx = self.grid.in_bounds(sw["lat"], sw["lng"], ne["lat"], ne["lng"])
+        idx = idx[np.isin(self.kinds[idx], list(kinds))]
+        if limit is not None and len(idx) > limit:
+            idx = idx[np.argsort(self.kinds[idx] != SPOT, kind="stable")][:limit]
+        return idx
+
+    def at(self, lat, lng):
+        """좌표가 정확히 일치하는 점 위치 (마커 클릭), 없으면 None"""
+        return self.by_coord.get(coord_key(lat, lng))
+
+    def nearest(self, lat, lon, k=5, kind=None):
+        """가까운 점 [(위치, 거리 km)] (kind를 주면 해당 종류만)"""
+        if kind is None:
+            idx, dist = self.grid.nearest(lat, lon, k)
+        else:
+            # 다른 종류가 섞여 있으므로 넉넉히 뽑은 뒤 거른다
+            idx, dist = self.grid.nearest(lat, lon, min(len(self), k * 4 + 16))
+            keep = self.kinds[idx] == kind
+            idx, dist = idx[keep][:k], dist[keep][:k]
+        return list(zip(idx.tolist(), dist.tolist()))
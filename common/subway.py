@@ -0,0 +1,237 @@
+# ----------------------------------------------------------
+# 지하철 승하차 데이터 (서울교통공사 일별 역별 승하차 CSV)
+# ----------------------------------------------------------
+# 원본 열: 사용일자(YYYYMMDD), 노선명, 역명, 승차총승객수, 하차총승객수
+
+import warnings
+from pathlib import Path
+
+import numpy as np
+import pandas as pd
+
+from common.columnar_cache import cached_build, cached_frame, path_tag, sources_fingerprint
+from common.csv_loader import read_csv_auto
+
+DATE_COL = "사용일자"
+LINE_COL = "노선명"
+STATION_COL = "역명"
+ON_COL = "승차총승객수"
+OFF_COL = "하차총승객수"
+SUBWAY_COLUMNS = [DATE_COL, LINE_COL, STATION_COL, ON_COL, OFF_COL]
+KEY_COLUMNS = [DATE_COL, LINE_COL, STATION_COL]
+
+# 폴더 모드 기본 위치: 월별 CSV를 여기에 넣어 두면 한꺼번에 읽는다
+SUBWAY_DATA_DIR = Path(__file__).resolve().parent.parent / "data" / "subway"
+CHUNK_ROWS = 200_000
+# 부분 집계가 이 행 수와 직전 합친 결과의 2배를 모두 넘으면 한 번 합쳐서 메모리를 줄인다
+# (절대 기준만 쓰면 고유 키가 많아진 뒤에는 청크마다 전체를 다시 합치게 된다)
+COMPACT_ROWS = 1_000_000
+
+
+def to_typed(df: pd.DataFrame) -> pd.DataFrame:
+    """날짜는 datetime, 노선/역명은 category, 승하차 수는 int32로 변환"""
+    missing = [c for c in SUBWAY_COLUMNS if c not in df.columns]
+    if missing:
+        raise ValueError(f"CSV에 필수 컬럼이 없습니다: {missing}. (필수: {SUBWAY_COLUMNS})")
+    out = pd.DataFrame({
+        DATE_COL: pd.to_datetime(df[DATE_COL].astype(str), format="%Y%m%d", errors="coerce"),
+        LINE_COL: df[LINE_COL].astype("category"),
+        STATION_COL: df[STATION_COL].astype("category"),
+        ON_COL: pd.to_numeric(df[ON_COL], errors="coerce").fillna(0).astype("int32"),
+        OFF_COL: pd.to_numeric(df[OFF_COL], errors="coerce").fillna(0).astype("int32"),
+    })
+    return out.dropna(subset=[DATE_COL])
+
+
+def read_subway_csv(path) -> pd.DataFrame:
+    """CSV 텍스트를 파싱해서 타입이 정해진 프레임으로 반환 (캐시 생성용)"""
+    return to_typed(read_csv_auto(path))
+
+
+def load_subway(path, columns=None) -> pd.DataFrame:
+    """Parquet 캐시를 통해 지하철 데이터를 로드 (최초 1회만 CSV 파싱)"""
+    return cached_frame(path, read_subway_csv, columns=columns)
+
+
+def resolve_data_dir(text) -> Path:
+    """사용자가 입력한 폴더 경로를 SUBWAY_DATA_DIR 안으로 제한 (상대 경로는 그 아래 기준)
+
+    웹에서 서버의 임의 폴더를 읽지 못하도록 바깥 경로면 ValueError.
+    """
+    base = SUBWAY_DATA_DIR.resolve()
+    path = Path(str(text).strip() or base).expanduser()
+    path = (path if path.is_absolute() else base / path).resolve()
+    if path != base and base not in path.parents:
+        raise ValueError(f"데이터 폴더는 {base} 안에서만 고를 수 있습니다.")
+    return path
+
+
+def list_subway_files(directory) -> list:
+    """폴더 안의 CSV 파일 목록 (이름순)"""
+    directory = Path(directory)
+    if not directory.is_dir():
+        return []
+    return sorted(str(p) for p in directory.glob("*.csv"))
+
+
+def _compact(parts: list) -> pd.DataFrame:
+    return pd.concat(parts).groupby(level=KEY_COLUMNS, sort=False).sum()
+
+
+def aggregate_subway_files(paths, chunksize: int = CHUNK_ROWS) -> pd.DataFrame:
+    """여러 월별 CSV를 chunksize 단위로 스트리밍하며 (날짜, 노선, 역)별로 합산
+
+    원본 행 전체를 메모리에 올리지 않고, 청크마다 집계한 부분 결과만 보관한다.
+    같은 날짜/역이 여러 파일에 중복돼 있으면 승하차 수가 합산된다.
+    """
+    parts, held, compacted = [], 0, 0
+    for path in paths:
+        for chunk in read_csv_auto(path, usecols=SUBWAY_COLUMNS, chunksize=chunksize):
+            typed = to_typed(chunk)
+            typed[LINE_COL] = typed[LINE_COL].astype(str)
+            typed[STATION_COL] = typed[STATION_COL].astype(str)
+            part = typed.groupby(KEY_COLUMNS, sort=False)[[ON_COL, OFF_COL]].sum()
+            parts.append(part)
+            held += len(part)
+            if held > max(COMPACT_ROWS, 2 * compacted):
+                parts = [_compact(parts)]
+                held = compacted = len(parts[0])
+    if not parts:
+        return to_typed(pd.DataFrame(columns=SUBWAY_COLUMNS))
+
+    out = _compact(parts).reset_index().sort_values(KEY_COLUMNS, kind="stable")
+    out[LINE_COL] = out[LINE_COL].astype("category")
+    out[STATION_COL] = out[STATION_COL].astype("category")
+    out[ON_COL] = out[ON_COL].astype("int32")
+    out[OFF_COL] = out[OFF_COL].astype("int32")
+    return out.reset_index(drop=True)
+
+
+def subway_files_version(paths) -> str:
+    """폴더 모드 데이터 버전 (파일 구성/수정시각이 바뀌면 달라짐)"""
+    return sources_fingerprint(paths)
+
+
+def load_subway_dir(directory, paths, columns=None) -> pd.DataFrame:
+    """여러 CSV의 스트리밍 집계 결과를 Parquet 캐시를 통해 로드 (캐시 이름은 폴더마다 따로)"""
+    return cached_build(
+        f"subway-dir-{path_tag(directory)}", subway_files_version(paths),
+        lambda: aggregate_subway_files(paths), columns=columns,
+    )
+
+
+TOTAL_COL = "총승객"
+
+
+def station_daily_means(df: pd.DataFrame) -> pd.DataFrame:
+    """역명별 일평균 승차/하차/합계 (환승역은 노선을 합친 뒤 날짜 평균)
+
+    열: 역명, 일평균승차, 일평균하차, 일평균합계, 집계일수
+    """
+    daily = df.groupby([STATION_COL, DATE_COL], observed=True)[[ON_COL, OFF_COL]].sum()
+    grouped = daily.groupby(level=STATION_COL, observed=True)
+    out = grouped.mean().rename(columns={ON_COL: "일평균승차", OFF_COL: "일평균하차"})
+    out["일평균합계"] = out["일평균승차"] + out["일평균하차"]
+    out["집계일수"] = grouped.size().astype("int32")
+    out = out.reset_index()
+    out[STATION_COL] = out[STATION_COL].astype(str)
+    return out
+
+
+class StationIndex:
+    """(사용일자, 노선명) → 총승객 내림차순으로 정렬된 역 구간 인덱스
+
+    전체 프레임을 한 번 정렬해 두고 각 (날짜, 노선) 묶음의 시작/끝 위치만
+    기억하므로, 조회는 불리언 마스크 스캔이나 재정렬 없이 슬라이스 한 번이다.
+    """
+
+    def __init__(self, df: pd.DataFrame):
+        ranked = df.assign(**{TOTAL_COL: df[ON_COL].astype("int64") + df[OFF_COL]})
+        ranked = ranked.sort_values(
+            [DATE_COL, LINE_COL, TOTAL_COL], ascending=[True, True, False], kind="stable"
+        ).reset_index(drop=True)
+        self.frame = ranked
+        self.spans = {}
+        if ranked.empty:
+            self.lines = []
+            return
+
+        dates = ranked[DATE_COL].to_numpy()
+        line_codes = ranked[LINE_COL].cat.codes.to_numpy()
+        change = np.flatnonzero((dates[1:] != dates[:-1]) | (line_codes[1:] != line_codes[:-1])) + 1
+        starts = np.r_[0, change]
+        stops = np.r_[change, len(ranked)]
+        lines = ranked[LINE_COL].to_numpy()
+        for s, e in zip(starts, stops):
+            self.spans[(pd.Timestamp(dates[s]), lines[s])] = (s, e)
+        self.lines = sorted(ranked[LINE_COL].unique())
+
+    def stations(self, date, line, top=None) -> pd.DataFrame:
+        """해당 날짜/노선의 역 목록 (총승객 내림차순). 없으면 빈 프레임"""
+        s, e = self.spans.get((pd.Timestamp(date), line), (0, 0))
+        if top is not None:
+            e = min(e, s + top)
+        return self.frame.iloc[s:e]
+
+
+WEEKDAY_NAMES = ["월", "화", "수", "목", "금", "토", "일"]
+
+
+class StationMatrix:
+    """날짜 × 역(노선, 역명) 총승객 행렬과 그 위의 시계열 지표
+
+    모든 역에 대해 한꺼번에(벡터 연산으로) 계산해 두므로
+    역을 바꿔 가며 보는 것은 열 하나를 꺼내는 비용뿐이다.
+    - rolling7: 7일 이동평균
+    - weekday_profile: 요일(월~일)별 평균
+    - zscore: 같은 요일 유형(주중/주말) 평균·표준편차 대비 z-점수
+    """
+
+    def __init__(self, df: pd.DataFrame, window: int = 7):
+        totals = df[ON_COL].astype("int64") + df[OFF_COL]
+        matrix = (
+            totals.groupby([df[DATE_COL], df[LINE_COL], df[STATION_COL]], observed=True).sum()
+            .unstack([LINE_COL, STATION_COL])
+        )
+        # 중간에 빠진 날짜도 행으로 채워서 이동평균 창이 실제 달력 기준이 되게 한다
+        if not matrix.empty:
+            matrix = matrix.reindex(pd.date_range(matrix.index.min(), matrix.index.max(), freq="D"))
+        self.daily = matrix.astype("float64")
+        self.rolling7 = self.daily.rolling(window, min_periods=1).mean()
+
+        weekday = self.daily.index.dayofweek
+        self.weekday_profile = self.daily.groupby(weekday).mean().reindex(range(7))
+        self.weekday_profile.index = WEEKDAY_NAMES
+
+        values = self.daily.to_numpy()
+        is_weekend = np.asarray(weekday >= 5)
+        mean = np.full_like(values, np.nan)
+        std = np.full_like(values, np.nan)
+        with np.errstate(invalid="ignore"), warnings.catch_warnings():
+            warnings.simplefilter("ignore", category=RuntimeWarning)
+            for mask in (is_weekend, ~is_weekend):
+                if mask.any():
+                    mean[mask] = np.nanmean(values[mask], axis=0)
+                    std[mask] = np.nanstd(values[mask], axis=0)
+            z = (values - mean) / np.where(std > 0, std, np.nan)
+        self.zscore = pd.DataFrame(z, index=self.daily.index, columns=self.daily.columns)
+
+    def stations_of(self, line) -> list:
+        cols = self.daily.columns
+        return sorted(cols[cols.get_level_values(0) == line].get_level_values(1))
+
+    def anomalies(self, threshold: float = 3.0) -> pd.DataFrame:
+        """|z| >= threshold 인 (날짜, 노선, 역) 목록 (|z| 내림차순)"""
+        z = self.zscore.to_numpy()
+        with np.errstate(invalid="ignore"):
+            rows, cols = np.nonzero(np.abs(z) >= threshold)
+        order = np.argsort(-np.abs(z[rows, cols]), kind="stable")
+        rows, cols = rows[order], cols[order]
+        columns = self.daily.columns
+        return pd.DataFrame({
+            DATE_COL: self.daily.index[rows],
+            LINE_COL: columns.get_level_values(0)[cols],
+            STATION_COL: columns.get_level_values(1)[cols],
+            "z": z[rows, cols],
+            TOTAL_COL: self.daily.to_numpy()[rows, cols],
+        })
@@ -0,0 +1,90 @@
+# ----------------------------------------------------------
+# 서버 측 페이지네이션 표
+# ----------------------------------------------------------
+# st.dataframe(df)는 프레임 전체를 브라우저로 보낸다. 여기서는 검색/정렬을
+# pandas에서 처리하고 현재 페이지에 해당하는 행만 직렬화해서 보낸다.
+
+import numpy as np
+import pandas as pd
+import streamlit as st
+
+NO_SORT = "(정렬 안 함)"
+ALL_COLUMNS = "(모든 문자열 열)"
+
+
+def _filter_mask(col: pd.Series, query: str) -> pd.Series:
+    """한 열에서 query를 포함하는 행 마스크"""
+    if isinstance(col.dtype, pd.CategoricalDtype):
+        # 범주형은 카테고리 목록에서 먼저 찾고 코드 비교만 한다
+        cats = col.cat.categories
+        hits = cats[cats.astype(str).str.contains(query, regex=False)]
+        return col.isin(hits)
+    if pd.api.types.is_numeric_dtype(col):
+        try:
+            return col == float(query)
+        except ValueError:
+            return pd.Series(False, index=col.index)
+    return col.astype(str).str.contains(query, regex=False, na=False)
+
+
+def filter_frame(df: pd.DataFrame, query: str, column=None) -> pd.DataFrame:
+    if not query:
+        return df
+    if column and column != ALL_COLUMNS:
+        return df[_filter_mask(df[column], query)]
+    text_cols = [c for c in df.columns if not pd.api.types.is_numeric_dtype(df[c])]
+    mask = pd.Series(False, index=df.index)
+    for c in text_cols:
+        mask |= _filter_mask(df[c], query)
+    return df[mask]
+
+
+def page_slice(df: pd.DataFrame, start: int, stop: int, sort_col=None, ascending=True) -> pd.DataFrame:
+    """정렬 기준으로 [start, stop) 구간 행만 반환 (같은 값은 원래 위치 순서, sort_values(kind="stable")와 같은 결과)
+
+    숫자 열은 앞쪽 stop개만 argpartition으로 골라 정렬하므로 앞 페이지를 볼 때
+    전체 정렬 비용을 내지 않는다. 경계 값과 같은 행은 모두 후보에 넣은 뒤 위치 순으로 자른다.
+    """
+    if not sort_col:
+        return df.iloc[start:stop]
+    col = df[sort_col]
+    if pd.api.types.is_numeric_dtype(col) and not col.isna().any() and 0 < stop < len(df):
+        values = col.to_numpy()
+        values = values if ascending else -values.astype("float64")
+        kth = values[np.argpartition(values, stop - 1)[stop - 1]]
+        head = np.flatnonzero(values <= kth)
+        head = head[np.lexsort((head, values[head]))]
+        return df.iloc[head[start:stop]]
+    return df.sort_values(sort_col, ascending=ascending, kind="stable").iloc[start:stop]
+
+def paginated_table(df: pd.DataFrame, key: str, page_size: int = 50, columns=None, height=None):
+    """검색 / 정렬 / 페이지 크기를 고를 수 있는 표 (보이는 페이지만 전송)"""
+    if columns is not None:
+        df = df[columns]
+
+    c1, c2, c3, c4 = st.columns([3, 2, 2, 1])
+    query = c1.text_input("검색", key=f"{key}_query", placeholder="포함된 값 검색")
+    filter_col = c2.selectbox("검색 열", [ALL_COLUMNS] + list(df.columns), key=f"{key}_filter_col")
+    sort_col = c3.selectbox("정렬 열", [NO_SORT] + list(df.columns), key=f"{key}_sort_col")
+    descending = c4.checkbox("내림차순", key=f"{key}_desc")
+
+    view = filter_frame(df, query.strip(), filter_col)
+    total = len(view)
+
+    p1, p2 = st.columns([1, 1])
+    size = p1.selectbox("페이지 크기", [25, 50, 100, 200],
+                        index=[25, 50, 100, 200].index(page_size) if page_size in (25, 50, 100, 200) else 1,
+                        key=f"{key}_size")
+    pages = max(1, -(-total // size))
+    page = p2.number_input(f"페이지 (전체 {pages})", min_value=1, max_value=pages, value=1, step=1, key=f"{key}_page")
+    page = min(int(page), pages)
+
+    start = (page - 1) * size
+    stop = min(start + size, total)
+    rows = page_slice(view, start, stop, None if sort_col == NO_SORT else sort_col, not descending)
+
+    st.dataframe(rows, use_container_width=True, height=height)
+    if total:
+        st.caption(f"{total:,}행 중 {start + 1:,}–{stop:,}행 표시")
+    else:
+        st.caption("조건에 맞는 행이 없습니다.")
@@ -8,3 +8,16 @@ if st.button('인사말 생성'):
   st.warning('방가방가!')
   st.error('혼또니 반갑다데스')
   st.balloons()
+
+# --- 앱에서 쓰는 데이터셋 (pages/*.py와 같은 공용 레지스트리) ---
+from common.datasets import DATASETS, dataset_exists, is_loaded
+
+with st.sidebar.expander('📦 데이터셋'):
+  for name, spec in DATASETS.items():
+    if not dataset_exists(name):
+      state = '파일 없음'
+    elif is_loaded(name):
+      state = '로드됨'
+    else:
+      state = '대기'
+    st.write(f'- {spec.label} (`{spec.filename}`): {state}')
@@ -1,49 +1,46 @@
 
 import streamlit as st
 
+from common.datasets import dataset_exists, dataset_path, load_dataset
+from common.recommendations import MBTI_TYPES
+
 # 🌸 제목
 st.title("🌈 MBTI로 보는 찰떡 진로 추천 💼✨")
 
 st.write("안녕하세요 ☀️ 오늘도 반짝이는 당신을 위한 맞춤 진로 추천 타임이에요 💖")
 st.write("아래에서 당신의 MBTI를 선택해보세요 👇")
 
-# MBTI 리스트
-mbti_list = [
-    "INTJ", "INTP", "ENTJ", "ENTP",
-    "INFJ", "INFP", "ENFJ", "ENFP",
-    "ISTJ", "ISFJ", "ESTJ", "ESFJ",
-    "ISTP", "ISFP", "ESTP", "ESFP"
-]
-
 # 선택 상자
-selected_mbti = st.selectbox("🌷 당신의 MBTI는 무엇인가요?", mbti_list)
-
-# MBTI별 진로 추천 데이터
-career_dict = {
-    "INTJ": ["🧠 데이터 사이언티스트", "🗺️ 전략 컨설턴트"],
-    "INTP": ["🔬 연구원", "💻 소프트웨어 개발자"],
-    "ENTJ": ["🏢 경영 컨설턴트", "🚀 프로젝트 매니저"],
-    "ENTP": ["💡 기업가", "📈 마케팅 전략가"],
-    "INFJ": ["💬 심리상담가", "📚 작가"],
-    "INFP": ["🎨 예술가", "🌿 사회복지사"],
-    "ENFJ": ["🍎 교육자", "🤝 인사 관리자"],
-    "ENFP": ["🎥 콘텐츠 크리에이터", "🎯 광고 기획자"],
-    "ISTJ": ["📊 회계사", "🏛️ 공무원"],
-    "ISFJ": ["💉 간호사", "🍀 초등교사"],
-    "ESTJ": ["👩‍💼 팀 리더", "🏗️ 운영 관리자"],
-    "ESFJ": ["💌 고객 서비스 매니저", "🗂️ 행정 직원"],
-    "ISTP": ["🔧 엔지니어", "🚗 정비 기술자"],
-    "ISFP": ["🎨 디자이너", "📸 사진작가"],
-    "ESTP": ["💼 세일즈 매니저", "🎉 이벤트 플래너"],
-    "ESFP": ["🎤 배우", "🌟 홍보 담당자"]
-}
+selected_mbti = st.selectbox("🌷 당신의 MBTI는 무엇인가요?", MBTI_TYPES)
+
+# MBTI별 진로 추천 데이터 (data/mbti_recommendations.json, 프로세스당 한 번 로드)
+if not dataset_exists("mbti_recommendations"):
+    st.error(f"추천 카탈로그 파일을 찾을 수 없습니다: {dataset_path('mbti_recommendations')}")
+    st.stop()
+catalogue = load_dataset("mbti_recommendations")
+
+PER_PAGE = 5
+NUMBER_EMOJI = ["1️⃣", "2️⃣", "3️⃣", "4️⃣", "5️⃣"]
+LINE_EMOJI = ["✨", "🌈"]
 
 # 결과 출력
 if selected_mbti:
     st.markdown("---")
     st.subheader(f"💫 {selected_mbti} 유형에게 어울리는 진로는 바로... 💫")
-    careers = career_dict[selected_mbti]
-    st.success(f"✨ 1️⃣ {careers[0]}")
-    st.success(f"🌈 2️⃣ {careers[1]}")
+    total = catalogue.count(selected_mbti, "career")
+    careers = catalogue.page(selected_mbti, "career", 1, PER_PAGE)
+    # 항목이 한 페이지를 넘으면 페이지 넘기기 / 무작위 뽑기
+    if total > PER_PAGE:
+        mode = st.radio("보는 방식", ["순서대로", "🎲 무작위"], horizontal=True, key="career_mode")
+        if mode == "순서대로":
+            pages = -(-total // PER_PAGE)
+            page = st.number_input(f"페이지 (전체 {pages}쪽, {total}개)", 1, pages, 1, key="career_page")
+            careers = catalogue.page(selected_mbti, "career", page, PER_PAGE)
+        else:
+            if st.button("🎲 다시 뽑기"):
+                st.session_state["career_seed"] = st.session_state.get("career_seed", 0) + 1
+            careers = catalogue.sample(selected_mbti, "career", PER_PAGE, seed=f"{selected_mbti}-{st.session_state.get('career_seed', 0)}")
+    for i, item in enumerate(careers):
+        st.success(f"{LINE_EMOJI[i % len(LINE_EMOJI)]} {NUMBER_EMOJI[i]} {item['title']}")
     st.markdown("---")
     st.caption("💌 당신의 개성과 열정이 반짝이는 길을 응원해요 🌟")
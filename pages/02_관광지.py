@@ -1,106 +1,149 @@
+import math
+
 import streamlit as st
-import folium
-from streamlit_folium import st_folium
+
+from common.datasets import dataset_exists, dataset_path, dataset_version, load_dataset
+from common.lazy import lazy_import
+from common.spots import SPOT, STATION, PoiStore
+
+# 관광지 ↔ 가까운 역 ↔ 승하차 표는 pandas가 필요하므로 관광지를 클릭했을 때 import
+spot_traffic = lazy_import("common.spot_traffic")
+
+# folium / streamlit_folium은 import가 무거우므로 지도를 실제로 그릴 때 import
+folium = lazy_import("folium")
+streamlit_folium = lazy_import("streamlit_folium")
+
+MAP_CENTER = [37.5665, 126.9780]
+MAP_ZOOM = 12
+MAP_WIDTH, MAP_HEIGHT = 950, 600
+MAX_MARKERS = 300  # 한 번에 브라우저로 보내는 마커 수 상한
+NEAREST_K = 5
+KIND_LABEL = {SPOT: "관광지", STATION: "지하철역"}
 
 # --- 페이지 제목 ---
 st.title("🇰🇷 외국인들이 사랑한 서울 관광지 Top 10 🌟")
 st.write("마커를 클릭하면 아래에 상세한 설명이 나타나요 ✨")
+show_stations = st.checkbox("🚇 지하철역 함께 보기", value=True)
+
+# --- 관광지 / 지하철역 좌표 (공용 레지스트리에서 프로세스당 한 번 로드) ---
+if not dataset_exists("seoul_spots"):
+    st.error(f"관광지 파일을 찾을 수 없습니다: {dataset_path('seoul_spots')}")
+    st.stop()
+spots_version = dataset_version("seoul_spots")
+stations_version = dataset_version("subway_stations") if dataset_exists("subway_stations") else None
+if show_stations and stations_version is None:
+    st.warning(f"지하철역 좌표 파일이 없어 관광지만 표시합니다: {dataset_path('subway_stations')}")
+
+
+@st.cache_resource(max_entries=4, show_spinner=False)
+def get_poi_store(spots_version: str, stations_version):
+    stations = load_dataset("subway_stations") if stations_version else []
+    return PoiStore(load_dataset("seoul_spots"), stations)
+
 
-# --- 관광지 데이터 ---
-spots = [
-    {
-        "name": "경복궁 (Gyeongbokgung Palace)",
-        "lat": 37.579617,
-        "lon": 126.977041,
-        "desc": "1395년에 세워진 경복궁은 조선 왕조의 법궁으로, 서울을 대표하는 궁궐이에요. 광화문을 지나 펼쳐지는 웅장한 전각들과 아름다운 연못, 그리고 고궁의 고요한 분위기가 어우러져 한국의 전통미를 느낄 수 있습니다. 외국인 방문객들은 수문장 교대식과 한복 체험을 통해 한국의 역사와 문화를 더욱 깊게 즐깁니다 🏯."
-    },
-    {
-        "name": "명동 (Myeongdong)",
-        "lat": 37.563757,
-        "lon": 126.982708,
-        "desc": "명동은 서울의 대표적인 쇼핑 거리이자 패션과 화장품의 중심지입니다. 전 세계 관광객들이 즐겨 찾는 명동에서는 길거리 음식, K-패션 브랜드, 그리고 한국 화장품 쇼핑을 한자리에서 즐길 수 있죠. 밤이 되면 네온사인으로 반짝이며 활기가 넘치는 거리 분위기가 매력적이에요 🛍️."
-    },
-    {
-        "name": "남산타워 (N Seoul Tower)",
-        "lat": 37.551169,
-        "lon": 126.988227,
-        "desc": "서울의 중심 남산 정상에 위치한 N서울타워는 도시의 스카이라인을 한눈에 내려다볼 수 있는 전망 명소입니다. 연인들이 사랑의 자물쇠를 걸며 약속을 남기는 로맨틱한 장소로도 유명하죠 💕. 낮에는 푸른 남산숲을, 밤에는 반짝이는 서울 야경을 감상할 수 있어요 🌇."
-    },
-    {
-        "name": "홍대 (Hongdae)",
-        "lat": 37.556383,
-        "lon": 126.923611,
-        "desc": "홍대는 예술과 젊음이 살아 숨 쉬는 거리로, 자유로운 분위기 속에서 스트리트 공연과 다양한 전시, 독립 카페, 그리고 감각적인 숍들을 만날 수 있습니다. 주말마다 열리는 프리마켓과 버스킹 공연은 홍대만의 개성을 보여주는 대표적인 볼거리예요 🎶."
-    },
-    {
-        "name": "북촌한옥마을 (Bukchon Hanok Village)",
-        "lat": 37.582604,
-        "lon": 126.983998,
-        "desc": "북촌한옥마을은 전통 한옥이 모여 있는 아름다운 마을로, 서울의 과거와 현재가 공존하는 특별한 공간이에요. 좁은 골목길을 따라 걷다 보면 고즈넉한 한옥의 기와와 나무 문살 사이로 한국의 정취가 느껴집니다. 사진 명소로도 인기가 많고, 한복을 입고 산책하는 사람들의 모습이 정겹습니다 🏠."
-    },
-    {
-        "name": "동대문디자인플라자 (DDP)",
-        "lat": 37.566540,
-        "lon": 127.009110,
-        "desc": "동대문디자인플라자(DDP)는 세계적인 건축가 자하 하디드가 설계한 미래형 건축물입니다. 부드럽게 흐르는 곡선의 외관이 인상적이며, 패션쇼, 전시, 야시장 등 다양한 문화 행사가 열립니다. 밤에는 화려한 조명과 함께 포토존으로도 인기 만점이에요 🏙️."
-    },
-    {
-        "name": "이태원 (Itaewon)",
-        "lat": 37.534525,
-        "lon": 126.994160,
-        "desc": "이태원은 다국적 문화가 공존하는 서울의 글로벌 거리입니다. 다양한 나라의 음식점, 바, 패션숍이 모여 있어 마치 작은 세계 여행을 하는 기분을 느낄 수 있죠 🌏. 외국인과 한국인이 자연스럽게 어울리는 자유로운 분위기가 매력적인 곳이에요."
-    },
-    {
-        "name": "청계천 (Cheonggyecheon Stream)",
-        "lat": 37.569103,
-        "lon": 126.978141,
-        "desc": "청계천은 서울 도심 속에서 자연을 느낄 수 있는 힐링 공간이에요. 맑은 물소리와 함께 산책로를 걷다 보면, 복잡한 도시의 소음이 잦아드는 듯한 평화를 느낄 수 있습니다. 밤에는 은은한 조명이 더해져 낭만적인 분위기를 자아내요 🌿."
-    },
-    {
-        "name": "롯데월드타워 (Lotte World Tower)",
-        "lat": 37.513068,
-        "lon": 127.102574,
-        "desc": "123층, 높이 555m의 롯데월드타워는 한국에서 가장 높은 건물이에요. 전망대 '서울스카이'에서는 360도 파노라마 뷰로 서울 전경을 감상할 수 있습니다. 쇼핑몰, 호텔, 영화관이 함께 있어 하루 종일 즐길 수 있는 복합 문화 공간이에요 🏙️."
-    },
-    {
-        "name": "한강공원 (Hangang Park)",
-        "lat": 37.528344,
-        "lon": 126.932617,
-        "desc": "한강공원은 서울 시민과 관광객 모두가 사랑하는 여가 공간이에요. 자전거 타기, 유람선 타기, 피크닉 등 다양한 액티비티를 즐길 수 있고, 여름엔 불꽃놀이와 음악 페스티벌이 열려요. 도시 속에서 여유를 느낄 수 있는 최고의 힐링 명소입니다 🛶."
+# --- 관광지별 가까운 역 + 일평균 승하차 (파일 버전마다 한 번 계산해 .cache/에 저장) ---
+@st.cache_resource(max_entries=4, show_spinner="가까운 역의 이용객 수를 계산하는 중...")
+def get_spot_traffic(spots_version: str, stations_version: str, subway_version):
+    def build():
+        subway_df = load_dataset("subway") if subway_version else None
+        return spot_traffic.build_spot_traffic(
+            load_dataset("seoul_spots"), load_dataset("subway_stations"), subway_df,
+        )
+
+    version = spot_traffic.spot_traffic_version(spots_version, stations_version, subway_version)
+    return spot_traffic.traffic_by_spot(spot_traffic.load_spot_traffic(version, build))
+
+
+# --- 기본 지도 (타일만) ---
+# 마커는 지도에 넣지 않고, 재실행마다 지금 화면 범위 안의 점만 FeatureGroup으로 만들어
+# feature_group_to_add로 넘긴다. 점이 수천 개여도 브라우저로 가는 마커는 MAX_MARKERS개 이하.
+# st_folium이 FeatureGroup을 지도에 붙이므로 지도는 공유하지 않고 실행마다 새로 만든다 (타일만이라 가볍다).
+def base_map():
+    return folium.Map(location=MAP_CENTER, zoom_start=MAP_ZOOM, tiles="CartoDB positron")
+
+
+def default_bounds():
+    """첫 실행(아직 지도에서 받은 범위가 없을 때)의 화면 범위: 중심/줌/지도 크기로 계산"""
+    deg_per_px = 360 / (256 * 2 ** MAP_ZOOM)
+    half_lon = MAP_WIDTH / 2 * deg_per_px
+    half_lat = MAP_HEIGHT / 2 * deg_per_px * math.cos(math.radians(MAP_CENTER[0]))
+    return {
+        "_southWest": {"lat": MAP_CENTER[0] - half_lat, "lng": MAP_CENTER[1] - half_lon},
+        "_northEast": {"lat": MAP_CENTER[0] + half_lat, "lng": MAP_CENTER[1] + half_lon},
     }
-]
 
-# --- 지도 생성 ---
-m = folium.Map(location=[37.5665, 126.9780], zoom_start=12, tiles="CartoDB positron")
 
-# --- 마커 추가 ---
-for spot in spots:
-    folium.Marker(
-        [spot["lat"], spot["lon"]],
-        popup=spot["name"],  # 클릭 시 이름만 반환되도록
-        tooltip="클릭해보세요 👆",
-        icon=folium.Icon(color="cadetblue", icon="info-sign")
-    ).add_to(m)
+def visible_markers(store: PoiStore, idx):
+    fg = folium.FeatureGroup(name="poi")
+    for i in idx.tolist():
+        p = store.items[i]
+        if store.kinds[i] == SPOT:
+            folium.Marker([p["lat"], p["lon"]], tooltip="클릭해보세요 👆", popup=p["name"]).add_to(fg)
+        else:
+            folium.CircleMarker(
+                [p["lat"], p["lon"]], radius=5, color="#1f77b4", fill=True, fill_opacity=0.8,
+                tooltip=f"🚇 {p['name']}", popup=p["name"],
+            ).add_to(fg)
+    return fg
 
-# --- 지도 표시 ---
-st_data = st_folium(m, width=950, height=600)
 
-# --- 클릭된 마커 정보 처리 ---
-clicked_name = None
-if st_data and st_data.get("last_object_clicked_popup"):
-    clicked_name = st_data["last_object_clicked_popup"]
+store = get_poi_store(spots_version, stations_version)
+
+# --- 지도 표시 (이전 실행에서 받은 화면 범위 안의 마커만) ---
+bounds = (st.session_state.get("spot_map") or {}).get("bounds") or default_bounds()
+kinds = (SPOT, STATION) if show_stations else (SPOT,)
+idx = store.in_view(bounds, kinds=kinds, limit=MAX_MARKERS)
+
+st_data = streamlit_folium.st_folium(
+    base_map(), width=MAP_WIDTH, height=MAP_HEIGHT, key="spot_map",
+    feature_group_to_add=visible_markers(store, idx),
+    returned_objects=["bounds", "last_clicked", "last_object_clicked", "last_object_clicked_popup"],
+)
+if len(idx) >= MAX_MARKERS:
+    st.caption(f"화면 안의 점이 많아 {MAX_MARKERS}개만 표시했습니다. 지도를 확대하면 나머지가 보여요.")
+
+# --- 클릭된 마커 정보 처리 (좌표 딕셔너리에서 바로 조회) ---
+st_data = st_data or {}
+clicked_obj = st_data.get("last_object_clicked")
+clicked = store.at(clicked_obj["lat"], clicked_obj["lng"]) if clicked_obj else None
 
 # --- 관광지 정보 표시 ---
 st.markdown("---")
 st.subheader("📍 선택한 관광지 정보")
 
-if clicked_name:
-    for spot in spots:
-        if spot["name"] == clicked_name:
-            st.markdown(f"### {spot['name']}")
-            st.write(spot["desc"])
-            break
+if clicked is not None and store.kinds[clicked] == SPOT:
+    st.markdown(f"### {store.items[clicked]['name']}")
+    st.write(store.items[clicked]["desc"])
+    if stations_version:
+        subway_version = dataset_version("subway") if dataset_exists("subway") else None
+        near = get_spot_traffic(spots_version, stations_version, subway_version).get(store.items[clicked]["id"], [])
+        st.markdown("**🚇 가까운 지하철역과 하루 평균 이용객**")
+        st.dataframe(
+            [
+                {"역명": r["역명"], "거리 (m)": round(r["거리_km"] * 1000)}
+                | {f"일평균 {c[3:]}": None if r[c] is None else round(r[c]) for c in ("일평균승차", "일평균하차", "일평균합계")}
+                for r in near
+            ],
+            use_container_width=True, hide_index=True,
+        )
+        if subway_version is None:
+            st.caption("지하철 승하차 파일이 없어 이용객 수는 비워 두었습니다.")
+elif clicked is not None:
+    st.markdown(f"### 🚇 {store.items[clicked]['name']}역")
 else:
     st.info("지도의 마커를 클릭하면 이곳에 상세 설명이 표시됩니다 💡")
 
+# --- 클릭한 위치에서 가까운 곳 (격자 인덱스로 주변 칸만 탐색) ---
+point = st_data.get("last_clicked") or clicked_obj
+if point:
+    st.subheader("📍 클릭한 위치에서 가까운 곳")
+    near = store.nearest(point["lat"], point["lng"], k=NEAREST_K + (clicked is not None))
+    st.dataframe(
+        [
+            {"종류": KIND_LABEL[store.kinds[i]], "이름": store.items[i]["name"], "거리 (m)": round(d * 1000)}
+            for i, d in near if i != clicked
+        ][:NEAREST_K],
+        use_container_width=True, hide_index=True,
+    )
+
 st.caption("© 2025 Seoul Travel Map with Folium 🌸")
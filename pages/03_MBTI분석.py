@@ -1,68 +1,45 @@
 # streamlit_mbti_app.py
 # Streamlit app: 국가별 MBTI 비율 시각화 (Plotly 인터랙티브)
-# 설명: CSV 업로드 또는 ../countriesMBTI_16types.csv 파일 사용
+# 설명: CSV 업로드 또는 번들 countriesMBTI_16types.csv 파일 사용 (common.datasets 레지스트리)
 # 사용법: streamlit run streamlit_mbti_app.py
 
 import streamlit as st
 import pandas as pd
-import plotly.graph_objects as go
-import plotly.express as px
-from io import StringIO
+import hashlib
 
-st.set_page_config(page_title="Country MBTI Explorer", layout="wide")
+from common.chart_cache import show_plotly
+from common.csv_loader import read_csv_auto
+from common.datasets import dataset_version, load_dataset
+from common.lazy import lazy_import
+from common.mbti import MBTI_COLUMNS, MbtiIndex
+from common.mbti_similarity import SimilarityEngine
+from common.palette import rank_colors, two_tone
+from common.perf import show_panel, stage, start_run
+from common.table_view import paginated_table
 
-MBTI_COLUMNS = ['INFJ','ISFJ','ISTJ','INTJ','INFP','ISFP','ISTP','INTP',
-                'ENFJ','ESFJ','ESTJ','ENTJ','ENFP','ESFP','ESTP','ENTP']
+go = lazy_import("plotly.graph_objects")  # 차트 캐시에 없는 그림을 만들 때만 import
 
-@st.cache_data
-def load_csv_from_path(path: str) -> pd.DataFrame:
-    df = pd.read_csv(path)
-    return df
+st.set_page_config(page_title="Country MBTI Explorer", layout="wide")
+start_run("03_MBTI분석")
 
 @st.cache_data
-def load_csv_from_buffer(buffer) -> pd.DataFrame:
-    df = pd.read_csv(buffer)
-    return df
-
-# Utility: interpolate between two hex colors
-def hex_to_rgb(hex_color: str):
-    hex_color = hex_color.lstrip('#')
-    return tuple(int(hex_color[i:i+2], 16) for i in (0, 2, 4))
-
-def rgb_to_hex(rgb_tuple):
-    return '#%02x%02x%02x' % rgb_tuple
-
-def interp_hex(c1, c2, t: float):
-    r1,g1,b1 = hex_to_rgb(c1)
-    r2,g2,b2 = hex_to_rgb(c2)
-    r = int(r1 + (r2-r1)*t)
-    g = int(g1 + (g2-g1)*t)
-    b = int(b1 + (b2-b1)*t)
-    return rgb_to_hex((r,g,b))
-
-# Create color list: 1st -> red, others -> blue gradient from deep to pale
-def make_colors_by_rank(n:int):
-    colors = []
-    if n <= 0:
-        return colors
-    red = '#E63946'  # top
-    deep_blue = '#0d6efd'  # 2nd color start
-    light_blue = '#e7f0ff' # fade to
-
-    colors.append(red)
-    if n == 1:
-        return colors
-
-    # For positions 2..n, compute gradient t from 0..1
-    for i in range(1, n):
-        # normalized position: 0 -> i=1 (2nd place) should be deep, i=n-1 -> light
-        t = (i-1) / max(1, (n-2)) if n>2 else 0
-        colors.append(interp_hex(deep_blue, light_blue, t))
-    return colors
+def load_csv_from_buffer(data: bytes) -> pd.DataFrame:
+    # 업로드 파일도 인코딩(UTF-8 / CP949 등)을 판별해 읽는다
+    return read_csv_auto(data)
+
+# 국가/유형 조회 인덱스: 불러온 파일 버전마다 한 번만 생성 (세션 간 공유)
+@st.cache_resource(max_entries=8, show_spinner=False)
+def get_mbti_index(data_version: str, _plot_df, types: tuple):
+    return MbtiIndex(_plot_df, types)
+
+# 모든 국가 쌍 유사도(상위 k개)와 군집: 파일 버전마다 한 번만 계산
+@st.cache_resource(max_entries=8, show_spinner="국가 간 유사도를 계산하는 중...")
+def get_similarity(data_version: str, _index):
+    return SimilarityEngine(_index.countries, _index.matrix, _index.types)
 
 # Load data: offer uploader or default path
 # --- Tabs added here ---
-tabs = st.tabs(["국가별 분석", "MBTI 유형별 Top 10"])
+tabs = st.tabs(["국가별 분석", "MBTI 유형별 Top 10", "비슷한 국가 · 군집"])
 
 with tabs[0]:
     st.title("🌍 Country MBTI Explorer — Plotly + Streamlit")
@@ -71,24 +48,30 @@ st.markdown("앱: 국가를 선택하면 해당 국가의 MBTI 비율을 인터
 with st.sidebar:
     st.header("데이터 입력")
     uploaded = st.file_uploader("CSV 파일 업로드 (열: Country + 16 MBTI columns)", type=['csv'])
-    use_example = st.checkbox('Use bundled example (if exists at ../countriesMBTI_16types.csv)', value=True)
+    use_example = st.checkbox('Use bundled example (countriesMBTI_16types.csv)', value=True)
 
 # Load dataframe
 df = None
-if uploaded is not None:
-    try:
-        df = load_csv_from_buffer(uploaded)
-    except Exception as e:
-        st.error(f"업로드한 파일을 읽는 중 오류가 발생했습니다: {e}")
-
-if df is None and use_example:
-    try:
-        df = load_csv_from_path('../countriesMBTI_16types.csv')
-    except Exception:
-        df = None
+data_version = None
+with stage('load', 'CSV 로드') as rec:
+    if uploaded is not None:
+        try:
+            df = load_csv_from_buffer(uploaded.getvalue())
+            data_version = 'upload|' + hashlib.sha1(uploaded.getvalue()).hexdigest()
+        except Exception as e:
+            st.error(f"업로드한 파일을 읽는 중 오류가 발생했습니다: {e}")
+
+    if df is None and use_example:
+        try:
+            # 번들 데이터는 프로세스 전체에서 한 번만 파싱된 공유 프레임
+            df = load_dataset('mbti_countries')
+            data_version = 'bundled|' + dataset_version('mbti_countries')
+        except Exception:
+            df = None
+    rec.rows = None if df is None else len(df)
 
 if df is None:
-    st.warning("데이터를 제공해주세요. 좌측에서 CSV 파일을 업로드하거나, ../countriesMBTI_16types.csv가 존재하는지 확인하세요.")
+    st.warning("데이터를 제공해주세요. 좌측에서 CSV 파일을 업로드하거나, countriesMBTI_16types.csv가 존재하는지 확인하세요.")
     st.stop()
 
 # Basic validation and cleanup
@@ -119,19 +102,21 @@ plot_df = plot_df.rename(columns=rename_map)
 # Fill NaN with zeros (or warn?)
 plot_df[avail_mbti] = plot_df[avail_mbti].fillna(0)
 
+with stage('aggregate', '국가/유형 인덱스', rows=len(plot_df)):
+    mbti_index = get_mbti_index(data_version, plot_df, tuple(avail_mbti))
+
 # Sidebar: country select
-countries = plot_df['Country'].astype(str).tolist()
+countries = mbti_index.countries.tolist()
 selected_country = st.sidebar.selectbox('국가 선택', countries)
 
-# Extract row
-row = plot_df[plot_df['Country'].astype(str) == str(selected_country)]
-if row.empty:
+# Extract row (인덱스에서 바로 조회)
+row = mbti_index.row(selected_country)
+if row is None:
     st.error('선택한 국가의 데이터가 없습니다.')
     st.stop()
 
-row = row.iloc[0]
 # Build series of MBTI -> value
-values = {mb: float(row[mb]) for mb in avail_mbti}
+values = {mb: float(v) for mb, v in zip(avail_mbti, row)}
 # If values look like proportions >1, detect and normalize
 max_val = max(values.values()) if values else 0
 if max_val > 1.1:
@@ -144,74 +129,129 @@ plot_series = plot_series.reset_index()
 plot_series.columns = ['MBTI','Ratio']
 plot_series['Pct'] = (plot_series['Ratio']*100).round(2)
 
-# Colors by rank
-colors = make_colors_by_rank(len(plot_series))
+# Colors by rank (1st -> red, others -> blue gradient from deep to pale, 미리 계산된 팔레트)
+colors = list(rank_colors(len(plot_series)))
 
 # Create Plotly figure (bars sorted by Ratio desc)
-fig = go.Figure()
-fig.add_trace(go.Bar(
-    x=plot_series['MBTI'],
-    y=plot_series['Ratio'],
-    text=plot_series['Pct'].astype(str) + '%',
-    textposition='auto',
-    marker=dict(color=colors, line=dict(width=0.5, color='rgba(0,0,0,0.1)')),
-    hovertemplate='<b>%{x}</b><br>비율: %{y:.4f} (%{text})<extra></extra>'
-))
-
-fig.update_layout(
-    title=f"{selected_country} — MBTI 비율 (상위부터 정렬)",
-    yaxis=dict(title='비율 (0-1)', tickformat='.2f'),
-    xaxis=dict(title='MBTI 유형'),
-    template='simple_white',
-    margin=dict(l=40, r=20, t=70, b=40),
-    height=520
-)
+def build_country_fig():
+    fig = go.Figure()
+    fig.add_trace(go.Bar(
+        x=plot_series['MBTI'],
+        y=plot_series['Ratio'],
+        text=plot_series['Pct'].astype(str) + '%',
+        textposition='auto',
+        marker=dict(color=colors, line=dict(width=0.5, color='rgba(0,0,0,0.1)')),
+        hovertemplate='<b>%{x}</b><br>비율: %{y:.4f} (%{text})<extra></extra>'
+    ))
+
+    fig.update_layout(
+        title=f"{selected_country} — MBTI 비율 (상위부터 정렬)",
+        yaxis=dict(title='비율 (0-1)', tickformat='.2f'),
+        xaxis=dict(title='MBTI 유형'),
+        template='simple_white',
+        margin=dict(l=40, r=20, t=70, b=40),
+        height=520
+    )
+    return fig
 
 # Show top summary
 top_mbti = plot_series.iloc[0]
 st.markdown(f"### {selected_country} — 가장 높은 MBTI: **{top_mbti['MBTI']}** ({top_mbti['Pct']}%)")
 
-st.plotly_chart(fig, use_container_width=True)
+# 같은 데이터/국가 조합이면 만들어 둔 그림을 재사용
+with stage('chart', '국가별 막대'):
+    show_plotly((data_version, 'country', selected_country), build_country_fig, use_container_width=True)
 
 # --- MBTI 유형별 Top 10 Tab ---
 with tabs[1]:
     st.header("MBTI 유형별 상위 10개 국가")
     selected_mbti = st.selectbox("MBTI 유형 선택", avail_mbti)
 
-    # Sort countries by selected MBTI
-    sorted_df = plot_df[['Country', selected_mbti]].sort_values(by=selected_mbti, ascending=False)
-    top10 = sorted_df.head(10)
-
-    # Colors: 한국(Korea) 강조
-    bar_colors = []
-    for c in top10['Country']:
-        if c.strip().lower() in ["korea", "south korea", "republic of korea", "대한민국"]:
-            bar_colors.append('#E63946')  # red
+    # 미리 계산된 유형별 순위에서 상위 10개만 꺼내기
+    with stage('filter', '유형별 Top 10', rows=len(mbti_index.countries)):
+        top10 = mbti_index.top(selected_mbti, 10)
+
+    # Colors: 한국(Korea) 강조 (red / blue, 국가별 한국 여부는 인덱스에 미리 계산)
+    bar_colors = two_tone(top10['is_korea'])
+
+    def build_top10_fig():
+        fig2 = go.Figure()
+        fig2.add_trace(go.Bar(
+            x=top10['Country'],
+            y=top10[selected_mbti],
+            text=(top10[selected_mbti]*100).round(2).astype(str)+'%',
+            textposition='auto',
+            marker=dict(color=bar_colors)
+        ))
+
+        fig2.update_layout(
+            title=f"{selected_mbti} 유형 비율 Top 10 국가",
+            yaxis=dict(title='비율 (0-1)'),
+            xaxis=dict(title='국가'),
+            template='simple_white',
+            height=520
+        )
+        return fig2
+
+    with stage('chart', 'Top 10 막대'):
+        show_plotly((data_version, 'top10', selected_mbti), build_top10_fig, use_container_width=True)
+
+# --- 비슷한 국가 / 군집 Tab ---
+with tabs[2]:
+    st.header("MBTI 분포가 비슷한 국가")
+    if len(mbti_index.countries) < 2 or not avail_mbti:
+        st.info("유사도를 계산하려면 국가 2개 이상과 MBTI 열이 필요합니다.")
+    else:
+        with stage('aggregate', '유사도 엔진', rows=len(mbti_index.countries)):
+            engine = get_similarity(data_version, mbti_index)
+        sim_countries = mbti_index.countries.tolist()
+        korea = mbti_index.is_korea.nonzero()[0]
+        base = st.selectbox("기준 국가", sim_countries,
+                            index=int(korea[0]) if len(korea) else 0, key="sim_country")
+        metric = st.radio("거리 기준", ["cosine", "euclidean"], horizontal=True,
+                          format_func=lambda m: "코사인 유사도" if m == "cosine" else "유클리드 거리")
+        with stage('filter', '비슷한 국가 조회'):
+            near = engine.neighbors(base, metric, 10)
+        st.subheader(f"{base}와(과) 가장 비슷한 10개 국가")
+        st.dataframe(near, use_container_width=True, hide_index=True)
+
+        st.subheader("k-means 군집")
+        if len(sim_countries) > 2:
+            n_clusters = st.slider("군집 수 (k)", 2, min(12, len(sim_countries)), min(5, len(sim_countries)))
         else:
-            bar_colors.append('#4dabf7')  # blue
-
-    fig2 = go.Figure()
-    fig2.add_trace(go.Bar(
-        x=top10['Country'],
-        y=top10[selected_mbti],
-        text=(top10[selected_mbti]*100).round(2).astype(str)+'%',
-        textposition='auto',
-        marker=dict(color=bar_colors)
-    ))
-
-    fig2.update_layout(
-        title=f"{selected_mbti} 유형 비율 Top 10 국가",
-        yaxis=dict(title='비율 (0-1)'),
-        xaxis=dict(title='국가'),
-        template='simple_white',
-        height=520
-    )
-
-    st.plotly_chart(fig2, use_container_width=True)
+            n_clusters = 2  # 국가가 2개뿐이면 고를 수 있는 k가 없다 (슬라이더 최소=최대)
+        with stage('aggregate', 'k-means 군집', rows=len(sim_countries)):
+            labels, centers = engine.clusters(n_clusters)
+        my_label = labels[engine.position[str(base)]]
+        members = sorted(engine.countries[labels == my_label].tolist())
+        st.markdown(f"**{base}**가 속한 군집 {my_label + 1} — {len(members)}개 국가")
+        st.write(", ".join(members))
+
+        def build_center_fig():
+            center_fig = go.Figure()
+            for c in range(len(centers)):
+                center_fig.add_trace(go.Bar(x=engine.types, y=centers[c], name=f"군집 {c + 1} ({(labels == c).sum()}개국)"))
+            center_fig.update_layout(
+                title="군집별 평균 MBTI 분포",
+                barmode='group',
+                yaxis=dict(title='비율 (행 합=1)'),
+                template='simple_white',
+                height=420
+            )
+            return center_fig
+
+        with stage('chart', '군집 중심 막대'):
+            show_plotly((data_version, 'clusters', n_clusters), build_center_fig, use_container_width=True)
 
 # Optional: show raw data table
 with st.expander('원본 데이터 보기'):
-    st.dataframe(row[ ['Country'] + avail_mbti ])
+    st.dataframe(plot_df.iloc[[mbti_index.position[selected_country]]][['Country'] + avail_mbti])
+
+# 전체 국가 표는 별도 보기 (현재 페이지 행만 브라우저로 전송)
+with st.expander('전체 국가 데이터 보기'):
+    paginated_table(plot_df, key='mbti_raw', columns=['Country'] + avail_mbti)
+
+show_panel()
 
 # Footer: tips
 st.markdown("---")
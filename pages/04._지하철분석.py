@@ -1,42 +1,98 @@
 import streamlit as st
-import pandas as pd
-import numpy as np
-import plotly.graph_objects as go
-from datetime import datetime
-import os
+
+from common.chart_cache import show_plotly
+from common.datasets import dataset_exists, dataset_version, load_dataset
+from common.lazy import lazy_import
+from common.palette import alpha_ramp
+from common.perf import show_panel, stage, start_run
+from common.subway import (
+    DATE_COL, LINE_COL, STATION_COL, SUBWAY_DATA_DIR, TOTAL_COL, StationIndex, StationMatrix,
+    list_subway_files, load_subway_dir, resolve_data_dir, subway_files_version,
+)
+from common.table_view import paginated_table
+
+go = lazy_import("plotly.graph_objects")  # 차트 캐시에 없는 그림을 만들 때만 import
 
 st.set_page_config(page_title="지하철 이용량 분석", layout="wide")
+start_run("04_지하철분석")
 
 # ----------------------------------------------------------
-# 🔹 CSV 경로 설정 (pages 폴더 → 상위 폴더의 CSV)
+# 🔹 CSV 로드 함수 (공용 레지스트리: 최초 1회 Parquet 캐시로 변환, 이후 프로세스 공유)
 # ----------------------------------------------------------
-CSV_PATH = os.path.join(os.path.dirname(__file__), "..", "wnlgkcjf.csv")
-CSV_PATH = os.path.abspath(CSV_PATH)
+def load_csv():
+    try:
+        return load_dataset("subway")
+    except Exception as e:
+        st.error(f"CSV 파일을 불러오는 중 오류 발생: {e}")
+        return None
 
 # ----------------------------------------------------------
-# 🔹 CSV 로드 함수 (UTF-8 → EUC-KR 순차 시도)
+# 🔹 (날짜, 호선) → 역 순위 인덱스 (데이터 버전별로 한 번만 생성, 세션 간 공유)
 # ----------------------------------------------------------
-def load_csv(path):
-    try:
-        return pd.read_csv(path, encoding="utf-8")
-    except:
-        try:
-            return pd.read_csv(path, encoding="euc-kr")
-        except Exception as e:
-            st.error(f"CSV 파일을 불러오는 중 오류 발생: {e}")
-            return None
+@st.cache_resource(max_entries=2, show_spinner=False)
+def get_station_index(data_version: str, _df):
+    return StationIndex(_df)
 
 # ----------------------------------------------------------
-# 🔹 CSV 로드
+# 🔹 날짜 × 역 행렬과 시계열 지표 (데이터 버전별로 한 번만 계산)
 # ----------------------------------------------------------
-if not os.path.exists(CSV_PATH):
-    st.error("❌ CSV 파일을 찾을 수 없습니다. 프로젝트 상위 폴더에 넣어주세요.")
-    st.stop()
+@st.cache_resource(max_entries=2, show_spinner=False)
+def get_station_matrix(data_version: str, _df):
+    return StationMatrix(_df)
+
+# ----------------------------------------------------------
+# 🔹 월별 CSV 폴더 집계 결과 (폴더/파일 버전별로 한 번만 읽어 세션 간 공유)
+# ----------------------------------------------------------
+# 처음 방문한 세션들이 동시에 들어와도 cache_resource가 한 세션만 계산하게 한다
+@st.cache_resource(max_entries=2, show_spinner=False)
+def get_subway_dir(data_version: str, data_dir: str, csv_files: tuple):
+    return load_subway_dir(data_dir, list(csv_files))
+
+# ----------------------------------------------------------
+# 🔹 CSV 로드 (단일 파일 또는 월별 CSV 폴더)
+# ----------------------------------------------------------
+st.sidebar.header("📂 데이터 소스")
+source_mode = st.sidebar.radio("불러올 데이터", ["기본 파일 (wnlgkcjf.csv)", "폴더의 월별 CSV 전체"])
+
+if source_mode.startswith("기본"):
+    if not dataset_exists("subway"):
+        st.error("❌ CSV 파일을 찾을 수 없습니다. 프로젝트 상위 폴더에 넣어주세요.")
+        st.stop()
+    with stage("load", "기본 CSV 로드") as rec:
+        df = load_csv()
+        rec.rows = None if df is None else len(df)
+    data_version = dataset_version("subway")
+else:
+    dir_text = st.sidebar.text_input(
+        "CSV 폴더 경로", value=str(SUBWAY_DATA_DIR), help=f"{SUBWAY_DATA_DIR} 또는 그 하위 폴더",
+    )
+    try:
+        data_dir = resolve_data_dir(dir_text)
+    except ValueError as e:
+        st.error(f"❌ {e}")
+        st.stop()
+    csv_files = list_subway_files(data_dir)
+    if not csv_files:
+        st.info(f"📁 `{data_dir}` 폴더에 월별 승하차 CSV를 넣어주세요.")
+        st.stop()
+    st.sidebar.caption(f"CSV {len(csv_files)}개를 청크 단위로 집계합니다.")
+    data_version = subway_files_version(csv_files)
+    try:
+        with st.spinner("월별 CSV를 집계하는 중... (최초 1회)"), stage("load", f"월별 CSV {len(csv_files)}개 집계") as rec:
+            df = get_subway_dir(data_version, str(data_dir), tuple(csv_files))
+            rec.rows = len(df)
+    except Exception as e:
+        st.error(f"CSV 파일을 불러오는 중 오류 발생: {e}")
+        df = None
 
-df = load_csv(CSV_PATH)
 if df is None:
     st.stop()
-st.write(df.columns.tolist())
+if df.empty:
+    st.warning("불러온 데이터에 유효한 행이 없습니다.")
+    st.stop()
+
+with stage("aggregate", "역 순위 인덱스", rows=len(df)):
+    station_index = get_station_index(data_version, df)
 
 st.success("CSV 파일이 정상적으로 로드되었습니다!")
 
@@ -45,11 +101,14 @@ st.success("CSV 파일이 정상적으로 로드되었습니다!")
 # ----------------------------------------------------------
 st.sidebar.header("🔍 조건 선택")
 
+# 날짜 범위는 불러온 데이터에서 결정
+min_date = df[DATE_COL].min().date()
+max_date = df[DATE_COL].max().date()
 sel_date = st.sidebar.date_input(
-    "날짜 선택 (2025년 10월)",
-    value=datetime(2025, 10, 1),
-    min_value=datetime(2025, 10, 1),
-    max_value=datetime(2025, 10, 31)
+    f"날짜 선택 ({min_date} ~ {max_date})",
+    value=max_date,
+    min_value=min_date,
+    max_value=max_date
 )
 
 # date_input이 리스트일 경우 대비
@@ -59,55 +118,115 @@ if isinstance(sel_date, list):
 # 날짜 형식 변환
 sel_date_str = sel_date.strftime("%Y-%m-%d")
 
-lines = sorted(df["호선"].unique())
+lines = station_index.lines
 sel_line = st.sidebar.selectbox("호선 선택", lines)
 
+tab_top, tab_ts = st.tabs(["🏆 상위 10개 역", "📈 역별 시계열 분석"])
+
 # ----------------------------------------------------------
 # 🔹 데이터 필터링
 # ----------------------------------------------------------
-filtered = df[(df["날짜"] == sel_date_str) & (df["호선"] == sel_line)]
-
-if filtered.empty:
-    st.warning("해당 조건에 맞는 데이터가 없습니다.")
-    st.stop()
-
-# 승차 + 하차 합계
-filtered["총승객"] = filtered["승차"] + filtered["하차"]
-
-# 상위 10개 역
-top10 = filtered.sort_values("총승객", ascending=False).head(10)
+# 미리 정렬된 인덱스에서 바로 상위 10개 역 조회
+with stage("filter", "날짜·호선 상위 10개 역") as rec:
+    top10 = station_index.stations(sel_date, sel_line, top=10)
+    rec.rows = len(top10)
 
 # ----------------------------------------------------------
 # 🔹 그래프 색상 설정 (1등=빨강, 나머지=파랑→연한 그라데이션)
 # ----------------------------------------------------------
-colors = ["red"] + [
-    f"rgba(0,0,255,{alpha})" for alpha in np.linspace(0.9, 0.3, 9)
-]
+colors = list(alpha_ramp(10))
 
 # ----------------------------------------------------------
 # 🔹 Plotly 막대그래프
 # ----------------------------------------------------------
-fig = go.Figure()
-
-fig.add_trace(
-    go.Bar(
-        x=top10["역명"],
-        y=top10["총승객"],
-        marker=dict(color=colors),
-        text=top10["총승객"],
-        textposition="outside"
-    )
-)
-
-fig.update_layout(
-    title=f"🚇 {sel_date_str} | {sel_line} 승·하차 합계 상위 10개 역",
-    xaxis_title="역명",
-    yaxis_title="총 승객 수",
-    template="plotly_white",
-    height=550
-)
-
-# ----------------------------------------------------------
-# 🔹 화면 출력
-# ----------------------------------------------------------
-st.plotly_chart(fig, use_container_width=True)
+with tab_top:
+    if top10.empty:
+        st.warning("해당 조건에 맞는 데이터가 없습니다.")
+    else:
+        def build_top10_fig():
+            fig = go.Figure()
+
+            fig.add_trace(
+                go.Bar(
+                    x=top10[STATION_COL].astype(str),
+                    y=top10[TOTAL_COL],
+                    marker=dict(color=colors),
+                    text=top10[TOTAL_COL],
+                    textposition="outside"
+                )
+            )
+
+            fig.update_layout(
+                title=f"🚇 {sel_date_str} | {sel_line} 승·하차 합계 상위 10개 역",
+                xaxis_title="역명",
+                yaxis_title="총 승객 수",
+                template="plotly_white",
+                height=550
+            )
+            return fig
+
+        # 같은 데이터/날짜/호선 조합이면 만들어 둔 그림을 재사용
+        with stage("chart", "상위 10개 역 막대"):
+            show_plotly((data_version, "top10", sel_date_str, sel_line), build_top10_fig, use_container_width=True)
+
+    with st.expander("원본 데이터 보기"):
+        paginated_table(df, key="subway_raw")
+
+# ----------------------------------------------------------
+# 🔹 역별 시계열 분석 (7일 이동평균 / 요일 패턴 / 이상치)
+# ----------------------------------------------------------
+with tab_ts:
+    with stage("aggregate", "날짜 × 역 행렬", rows=len(df)):
+        station_matrix = get_station_matrix(data_version, df)
+    stations = station_matrix.stations_of(sel_line)
+    sel_station = st.selectbox("역 선택", stations, key="ts_station")
+
+    if sel_station:
+        key = (sel_line, sel_station)
+        daily = station_matrix.daily[key]
+        rolling = station_matrix.rolling7[key]
+
+        def build_ts_fig():
+            ts_fig = go.Figure()
+            ts_fig.add_trace(go.Bar(x=daily.index, y=daily, name="일별 총승객", marker_color="rgba(0,0,255,0.3)"))
+            ts_fig.add_trace(go.Scatter(x=rolling.index, y=rolling, name="7일 이동평균", line=dict(color="red")))
+            ts_fig.update_layout(
+                title=f"🚉 {sel_line} {sel_station} 일별 승·하차 합계",
+                xaxis_title="날짜",
+                yaxis_title="총 승객 수",
+                template="plotly_white",
+                height=450
+            )
+            return ts_fig
+
+        with stage("chart", "역별 시계열"):
+            show_plotly((data_version, "station", sel_line, sel_station), build_ts_fig, use_container_width=True)
+
+        profile = station_matrix.weekday_profile[key]
+        weekday_mean = profile.iloc[:5].mean()
+        weekend_mean = profile.iloc[5:].mean()
+        c1, c2, c3 = st.columns(3)
+        c1.metric("주중 평균", f"{weekday_mean:,.0f}")
+        c2.metric("주말 평균", f"{weekend_mean:,.0f}")
+        if weekday_mean > 0:
+            c3.metric("주말/주중 비율", f"{weekend_mean / weekday_mean:.2f}")
+
+        def build_weekday_fig():
+            wd_fig = go.Figure(go.Bar(x=profile.index, y=profile, marker_color="rgba(0,0,255,0.6)"))
+            wd_fig.update_layout(title="요일별 평균 총승객", template="plotly_white", height=350)
+            return wd_fig
+
+        with stage("chart", "요일별 평균"):
+            show_plotly((data_version, "weekday", sel_line, sel_station), build_weekday_fig, use_container_width=True)
+
+    st.subheader("⚠️ 이상치 (같은 주중/주말 유형 대비 z-점수)")
+    threshold = st.slider("z-점수 기준", 2.0, 5.0, 3.0, 0.5, key="ts_threshold")
+    only_line = st.checkbox("선택한 호선만 보기", value=False, key="ts_only_line")
+    with stage("filter", "이상치 추출", rows=station_matrix.zscore.size):
+        anomalies = station_matrix.anomalies(threshold)
+        if only_line:
+            anomalies = anomalies[anomalies[LINE_COL] == sel_line]
+    st.caption(f"전체 {station_matrix.daily.shape[1]}개 역 중 기준을 넘은 기록 {len(anomalies)}건")
+    st.dataframe(anomalies.head(200), use_container_width=True, hide_index=True)
+
+show_panel()
@@ -1,57 +1,66 @@
 import streamlit as st
 import pandas as pd
-import altair as alt
-import io
+import hashlib
+
+from common import admissions
+from common.admissions import AdmissionsSummary
+from common.admissions_feed import AdmissionsFeed
+from common.chart_cache import show_altair
+from common.csv_loader import read_csv_auto, url_version
+from common.datasets import dataset_exists, dataset_path
+from common.lazy import lazy_import
+from common.perf import show_panel, stage, start_run, timed
+from common.table_view import paginated_table
+
+alt = lazy_import("altair")  # 차트 캐시에 없는 차트를 만들 때만 import
 
 st.set_page_config(page_title="강원랜드 외국인 분석", layout="wide")
+start_run("05_수행")
 st.title("🎰 강원랜드 외국인 국가별 일일 입장현황 분석 대시보드")
 
 # ---------------- 유틸 함수 ----------------
 def load_csv_from_bytes(b: bytes):
-    """바이트를 받아서 여러 인코딩으로 시도해 판다스로 읽기"""
+    """바이트 앞부분으로 인코딩을 판별한 뒤 판다스로 한 번만 읽기"""
     if not b or len(b) == 0:
         raise pd.errors.EmptyDataError("Uploaded file is empty (0 bytes).")
-    bio = io.BytesIO(b)
-    # 시도 1: utf-8
-    try:
-        bio.seek(0)
-        return pd.read_csv(bio, encoding="utf-8")
-    except Exception:
-        pass
-    # 시도 2: cp949 (euc-kr)
-    try:
-        bio.seek(0)
-        return pd.read_csv(bio, encoding="cp949")
-    except Exception:
-        pass
-    # 시도 3: 텍스트로 디코딩(깨지는 문자 대체) 후 읽기
-    try:
-        text = b.decode("utf-8", errors="replace")
-        return pd.read_csv(io.StringIO(text))
-    except Exception as e:
-        raise e
+    return read_csv_auto(b)
 
 def load_csv_from_url(url: str):
-    """URL에서 직접 읽기 (GitHub raw 등). 인코딩 시도 포함"""
-    try:
-        return pd.read_csv(url, encoding="utf-8")
-    except Exception:
-        try:
-            return pd.read_csv(url, encoding="cp949")
-        except Exception as e:
-            raise e
+    """URL에서 한 번만 내려받아 읽기 (GitHub raw 등). 인코딩 자동 판별"""
+    return read_csv_auto(url)
 
 def validate_df(df: pd.DataFrame):
-    """필수 컬럼이 있는지 검사하고 입장일자 파싱"""
-    required = ["입장일자", "국가명", "외국인 입장객 수"]
-    missing = [c for c in required if c not in df.columns]
-    if missing:
-        raise ValueError(f"CSV에 필수 컬럼이 없습니다: {missing}. (필수: {required})")
-    # 날짜 파싱 (에러는 NaT로)
-    df["입장일자"] = pd.to_datetime(df["입장일자"], errors="coerce")
-    if df["입장일자"].isna().all():
-        st.warning("입장일자 컬럼이 존재하나 전부 날짜로 변환되지 않았습니다. (format 문제)")
-    return df
+    """필수 컬럼 검사 + 입장일자 파싱(에러는 NaT) + 입장객 수 숫자 변환"""
+    return admissions.to_typed(df)
+
+# ---------------- 공유 캐시 ----------------
+# 파싱된 프레임은 세션마다 따로 들고 있지 않고, 내용 해시(업로드) 또는
+# URL+버전(ETag 등)을 키로 프로세스 전체에서 하나만 보관한다.
+# 같은 파일을 여러 사용자가 열어도 파싱/메모리는 한 번이며, 오래된 항목은 자동으로 밀려난다.
+# 반환된 프레임은 여러 세션이 공유하므로 페이지에서 직접 수정하지 않는다.
+@st.cache_resource(max_entries=8, show_spinner=False)
+def load_uploaded(digest: str, _data: bytes):
+    return validate_df(load_csv_from_bytes(_data))
+
+@st.cache_resource(max_entries=8, ttl=3600, show_spinner=False)
+def load_url(url: str, version: str):
+    return validate_df(load_csv_from_url(url))
+
+@st.cache_data(ttl=60, show_spinner=False)
+def get_url_version(url: str):
+    return url_version(url)
+
+# 번들 파일은 매일 끝에 행이 추가되므로 피드 하나를 프로세스 전체에서 공유하며
+# 재실행마다 새로 붙은 줄만 읽어 합계에 더한다 (변화가 없으면 stat 한 번으로 끝)
+@st.cache_resource(show_spinner=False)
+def get_feed(path: str):
+    return AdmissionsFeed(path)
+
+# 국가별/일자별 합계, 기본 통계 등은 데이터 버전마다 한 번만 계산
+@timed("aggregate", "국가별/일자별 집계", rows=lambda s: s.rows)
+@st.cache_resource(max_entries=8, show_spinner=False)
+def get_summary(data_version: str, _df):
+    return AdmissionsSummary(_df)
 
 # ---------------- 입력 UI ----------------
 st.markdown("업로드할 CSV 파일을 선택하거나, GitHub raw 파일 URL을 입력하세요.")
@@ -63,38 +72,25 @@ with col1:
 with col2:
     url_input = st.text_input("또는 GitHub raw URL 입력 (선택)", value="")
 
+use_bundled = st.checkbox("업로드/URL이 없으면 번들 데이터(인공지능 수행.csv) 사용", value=True)
+
 # ---------------- 데이터 로드 ----------------
 df = None
-
-# 우선 세션에 이미 데이터 있으면 그것을 사용 (리로드 안전)
-if "df_cached" in st.session_state and st.session_state["df_cached"] is not None:
-    df = st.session_state["df_cached"]
-
-# URL이 입력되었고 아직 df가 없으면 URL로 시도
-if df is None and url_input:
-    try:
-        with st.spinner("URL에서 CSV를 불러오는 중..."):
-            df = load_csv_from_url(url_input.strip())
-            df = validate_df(df)
-            st.session_state["df_cached"] = df
-            st.success("URL에서 CSV를 성공적으로 불러왔습니다.")
-    except pd.errors.EmptyDataError:
-        st.error("URL의 파일이 비어 있습니다.")
-    except Exception as e:
-        st.error(f"URL에서 CSV를 읽는 중 오류 발생: {e}")
+data_version = None
+summary = None
 
 # 업로드 파일이 있으면 업로더 우선
 if uploaded_file is not None:
     try:
         # 안전하게 바이트 읽기
-        b = uploaded_file.read()
+        b = uploaded_file.getvalue()
         if b is None or len(b) == 0:
             st.error("업로드한 파일이 비어 있습니다. 다른 파일을 시도하세요.")
         else:
-            with st.spinner("업로드 파일을 읽는 중..."):
-                df = load_csv_from_bytes(b)
-                df = validate_df(df)
-                st.session_state["df_cached"] = df
+            with st.spinner("업로드 파일을 읽는 중..."), stage("load", "업로드 CSV") as rec:
+                data_version = hashlib.sha256(b).hexdigest()
+                df = load_uploaded(data_version, b)
+                rec.rows = len(df)
                 st.success("파일 업로드 및 파싱 성공.")
     except pd.errors.EmptyDataError:
         st.error("업로드한 파일이 비어 있습니다 (EmptyDataError).")
@@ -103,78 +99,121 @@ if uploaded_file is not None:
     except Exception as e:
         st.error(f"파일을 읽는 도중 오류가 발생했습니다: {e}")
 
+# 업로드가 없고 URL이 입력되었으면 URL로 시도
+elif url_input:
+    url = url_input.strip()
+    try:
+        with st.spinner("URL에서 CSV를 불러오는 중..."), stage("load", "URL CSV") as rec:
+            version = get_url_version(url)
+            df = load_url(url, version)
+            rec.rows = len(df)
+            data_version = f"{url}|{version}"
+            st.success("URL에서 CSV를 성공적으로 불러왔습니다.")
+    except pd.errors.EmptyDataError:
+        st.error("URL의 파일이 비어 있습니다.")
+    except Exception as e:
+        st.error(f"URL에서 CSV를 읽는 중 오류 발생: {e}")
+
+# 둘 다 없으면 번들 데이터 (추가된 일자만 증분 반영)
+elif use_bundled and dataset_exists("admissions"):
+    try:
+        feed = get_feed(str(dataset_path("admissions")))
+        with stage("load", "번들 피드 새로고침") as rec:
+            status = feed.refresh()
+            rec.rows = feed.last_added
+        summary = feed.summary
+        df = summary.frame
+        data_version = f"bundled|{feed.version}"
+        if status == "append":
+            st.caption(f"새로 추가된 {feed.last_added}행만 읽어 집계에 반영했습니다 (마지막 일자 {summary.last_date.date()}).")
+    except Exception as e:
+        st.error(f"번들 CSV를 읽는 중 오류 발생: {e}")
+
 # ---------------- df 준비 완료 후 UI ----------------
 if df is None:
     st.info("왼쪽에서 CSV를 업로드하거나 오른쪽에 GitHub raw URL을 입력하세요.")
     st.stop()
 
-# 안전: 외국인 입장객 수를 숫자로 변환
-df["외국인 입장객 수"] = pd.to_numeric(df["외국인 입장객 수"], errors="coerce").fillna(0).astype(int)
+if df["입장일자"].isna().all():
+    st.warning("입장일자 컬럼이 존재하나 전부 날짜로 변환되지 않았습니다. (format 문제)")
+
+if summary is None:
+    summary = get_summary(data_version, df)
 
 # ---- 원본 데이터 보기 ----
-st.subheader("📌 원본 데이터 (샘플)")
-st.dataframe(df.head(200))
+st.subheader("📌 원본 데이터")
+with stage("filter", "원본 표 페이지", rows=len(df)):
+    paginated_table(df, key="raw")
 
 # ---- 기본 통계 ----
 st.subheader("📊 기본 통계")
-st.write(df.describe(include="all"))
+with stage("aggregate", "기본 통계 (describe)", rows=summary.rows):
+    st.write(summary.describe)
 
 # ---- 국가별 TOP10 ----
 st.subheader("🌍 국가별 총 방문객 수 TOP 10")
-country_sum = df.groupby("국가명", dropna=False)["외국인 입장객 수"].sum().reset_index()
-top10 = country_sum.sort_values("외국인 입장객 수", ascending=False).head(10)
-bar = alt.Chart(top10).mark_bar().encode(
-    x=alt.X("국가명:N", sort=None),
-    y="외국인 입장객 수:Q",
-    tooltip=["국가명", "외국인 입장객 수"]
-)
-st.altair_chart(bar, use_container_width=True)
+top10 = summary.country_totals.head(10)
+def build_bar():
+    return alt.Chart(top10).mark_bar().encode(
+        x=alt.X("국가명:N", sort=None),
+        y="외국인 입장객 수:Q",
+        tooltip=["국가명", "외국인 입장객 수"]
+    )
+with stage("chart", "국가별 TOP 10 막대"):
+    show_altair((data_version, "top10"), build_bar, use_container_width=True)
 
 # ---- 일자별 총합 ----
 st.subheader("📅 일자별 총 방문객 수")
-daily = df.groupby("입장일자")["외국인 입장객 수"].sum().reset_index()
-area = alt.Chart(daily).mark_area().encode(
-    x="입장일자:T",
-    y="외국인 입장객 수:Q"
-)
-st.altair_chart(area, use_container_width=True)
+daily = summary.daily
+def build_area():
+    return alt.Chart(daily).mark_area().encode(
+        x="입장일자:T",
+        y="외국인 입장객 수:Q"
+    )
+with stage("chart", "일자별 합계 영역"):
+    show_altair((data_version, "daily"), build_area, use_container_width=True)
 
 # ---- 특정 국가 선택 ----
 st.subheader("📌 특정 국가 선택 분석")
-countries = sorted(df["국가명"].dropna().unique())
+countries = summary.countries
 selected = st.selectbox("국가 선택", countries, index=0 if len(countries)>0 else None)
 
 if selected:
-    sel_df = df[df["국가명"] == selected].sort_values("입장일자")
-    st.write(f"### 📈 {selected} 방문객 추이 (총 {sel_df['외국인 입장객 수'].sum()}명)")
-    st.dataframe(sel_df[["입장일자", "외국인 입장객 수"]].reset_index(drop=True), height=300)
-    line = alt.Chart(sel_df).mark_line(point=True).encode(
-        x="입장일자:T",
-        y="외국인 입장객 수:Q",
-        tooltip=["입장일자", "외국인 입장객 수"]
-    )
-    st.altair_chart(line, use_container_width=True)
+    sel_df = summary.country_rows(selected)
+    st.write(f"### 📈 {selected} 방문객 추이 (총 {summary.total(selected)}명)")
+    paginated_table(sel_df, key="selected", columns=["입장일자", "외국인 입장객 수"], page_size=25)
+    def build_line():
+        return alt.Chart(sel_df).mark_line(point=True).encode(
+            x="입장일자:T",
+            y="외국인 입장객 수:Q",
+            tooltip=["입장일자", "외국인 입장객 수"]
+        )
+    with stage("chart", "선택 국가 추이"):
+        show_altair((data_version, "country", selected), build_line, use_container_width=True)
 
 # ---- 국가명 직접 검색 기능 ----
 st.subheader("🔍 국가명 직접 검색")
 search = st.text_input("국가명을 직접 입력하세요 (예: 미국)")
 
 if search:
-    if search in df["국가명"].values:
-        sdf = df[df["국가명"] == search].sort_values("입장일자")
-        total = int(sdf["외국인 입장객 수"].sum())
+    if search in summary:
+        sdf = summary.country_rows(search)
+        total = summary.total(search)
         st.write(f"**{search} 총 방문객 수:** {total}명")
-        st.dataframe(sdf[["입장일자", "외국인 입장객 수"]].reset_index(drop=True))
-        # 최대/최소
+        paginated_table(sdf, key="search", columns=["입장일자", "외국인 입장객 수"], page_size=25)
+        # 최대/최소 (미리 계산된 값 조회)
         if not sdf.empty:
-            maxrow = sdf.loc[sdf["외국인 입장객 수"].idxmax()]
-            minrow = sdf.loc[sdf["외국인 입장객 수"].idxmin()]
+            maxrow, minrow = summary.extremes(search)
             st.write(f"- 🔥 최대 방문일: {maxrow['입장일자'].date()} — {int(maxrow['외국인 입장객 수'])}명")
             st.write(f"- 🧊 최소 방문일: {minrow['입장일자'].date()} — {int(minrow['외국인 입장객 수'])}명")
-            trend = alt.Chart(sdf).mark_line(point=True).encode(x="입장일자:T", y="외국인 입장객 수:Q", tooltip=["입장일자","외국인 입장객 수"])
-            st.altair_chart(trend, use_container_width=True)
+            def build_trend():
+                return alt.Chart(sdf).mark_line(point=True).encode(x="입장일자:T", y="외국인 입장객 수:Q", tooltip=["입장일자","외국인 입장객 수"])
+            with stage("chart", "검색 국가 추이"):
+                show_altair((data_version, "search", search), build_trend, use_container_width=True)
     else:
         st.warning("해당 국가가 데이터에 없습니다. 국가명 철자(공백/대소문자)를 확인하세요.")
 
 st.markdown("---")
 st.caption("앱 실행 중 문제가 계속되면 `app.py`가 레포 최상위에 있는지, 업로드한 CSV가 실제로 내용이 있는지(빈 파일 아님)를 다시 확인해 주세요.")
+
+show_panel()
@@ -1,116 +1,148 @@
 import streamlit as st
 import pandas as pd
-import altair as alt
-import io
+import os
+
+from common import admissions
+from common.admissions import AdmissionsSummary
+from common.chart_cache import show_altair
+from common.csv_loader import read_csv_auto
+from common.lazy import lazy_import
+from common.mirror import fetch_mirrored
+from common.perf import show_panel, stage, start_run, timed
+from common.table_view import paginated_table
+
+alt = lazy_import("altair")  # 차트 캐시에 없는 차트를 만들 때만 import
 
 st.set_page_config(page_title="강원랜드 외국인 분석", layout="wide")
+start_run("07_수행 복사본")
 st.title("🎰 강원랜드 외국인 국가별 일일 입장현황 분석 대시보드")
 
 # ---------------------------------------------------
 # 1) GitHub RAW CSV URL 지정 (여기만 당신의 주소로 변경!)
 # ---------------------------------------------------
-CSV_URL = "https://raw.githubusercontent.com/tjrgbs/ai_projectc1/main/wnlgkgf.csv"
+# (환경변수 ADMISSIONS_CSV_URL로 덮어쓸 수 있음 - 로컬 테스트 서버 등)
+CSV_URL = os.environ.get(
+    "ADMISSIONS_CSV_URL",
+    "https://raw.githubusercontent.com/tjrgbs/ai_projectc1/main/wnlgkgf.csv",
+)
 
 # ---------------------------------------------------
 # 2) CSV 로딩 함수
 # ---------------------------------------------------
-def load_csv_from_web(url: str):
-    try:
-        df = pd.read_csv(url, encoding="utf-8")
-        return df
-    except:
-        df = pd.read_csv(url, encoding="cp949")
-        return df
+# 원격 파일은 로컬 미러(.cache/mirror)에 받아 두고 ETag/Last-Modified로 재검증만 한다.
+# 파싱 결과는 미러 내용 버전별로 한 번만 만들어 모든 세션이 공유한다 (수정 금지).
+@st.cache_resource(max_entries=4, show_spinner=False)
+def load_mirrored_csv(path: str, version: str):
+    # 인코딩은 파일 앞부분으로 판별하고 파싱은 한 번만
+    return validate_df(read_csv_auto(path))
 
 def validate_df(df: pd.DataFrame):
-    required = ["입장일자", "국가명", "외국인 입장객 수"]
-    missing = [c for c in required if c not in df.columns]
-    if missing:
-        raise ValueError(f"CSV에 필수 컬럼 없음: {missing}")
+    # 필수 컬럼 검사 + 입장일자/입장객 수 타입 변환 (05 페이지와 같은 규칙)
+    return admissions.to_typed(df)
 
-    df["입장일자"] = pd.to_datetime(df["입장일자"], errors="coerce")
-    return df
+# 국가별/일자별 합계, 기본 통계 등은 데이터 버전마다 한 번만 계산
+@timed("aggregate", "국가별/일자별 집계", rows=lambda s: s.rows)
+@st.cache_resource(max_entries=8, show_spinner=False)
+def get_summary(data_version: str, _df):
+    return AdmissionsSummary(_df)
 
 # ---------------------------------------------------
 # 3) CSV 자동 로드
 # ---------------------------------------------------
 try:
-    df = load_csv_from_web(CSV_URL)
-    df = validate_df(df)
-    st.success("CSV 파일을 GitHub에서 자동으로 불러왔습니다.")
+    with stage("load", "미러 재검증"):
+        mirrored = fetch_mirrored(CSV_URL)
+    with stage("load", "CSV 파싱") as rec:
+        df = load_mirrored_csv(str(mirrored.path), mirrored.version)
+        rec.rows = len(df)
+    if mirrored.status == "offline":
+        st.warning(f"GitHub에 연결할 수 없어 마지막으로 받아 둔 로컬 사본을 사용합니다. ({mirrored.detail})")
+    elif mirrored.status == "server-error":
+        st.warning(f"GitHub 서버가 오류를 돌려줘 마지막으로 받아 둔 로컬 사본을 사용합니다. ({mirrored.detail})")
+    else:
+        st.success("CSV 파일을 GitHub에서 자동으로 불러왔습니다.")
 except Exception as e:
     st.error(f"CSV 파일 불러오기 오류: {e}")
     st.stop()
 
-# 숫자형 변환
-df["외국인 입장객 수"] = pd.to_numeric(df["외국인 입장객 수"], errors="coerce").fillna(0).astype(int)
+summary = get_summary(mirrored.version, df)
 
 # ---------------- 데이터 표시 ----------------
 st.subheader("📌 원본 데이터")
-st.dataframe(df)
+with stage("filter", "원본 표 페이지", rows=len(df)):
+    paginated_table(df, key="raw")
 
 st.subheader("📊 기본 통계")
-st.write(df.describe(include="all"))
+with stage("aggregate", "기본 통계 (describe)", rows=summary.rows):
+    st.write(summary.describe)
 
 # ---------------- TOP 10 국가 분석 ----------------
 st.subheader("🌍 국가별 총 방문객 수 TOP 10")
-country_sum = df.groupby("국가명")["외국인 입장객 수"].sum().reset_index()
-top10 = country_sum.sort_values("외국인 입장객 수", ascending=False).head(10)
+top10 = summary.country_totals.dropna(subset=["국가명"]).head(10)
 
-bar = alt.Chart(top10).mark_bar().encode(
-    x=alt.X("국가명:N", sort=None),
-    y="외국인 입장객 수:Q",
-    tooltip=["국가명", "외국인 입장객 수"]
-)
-st.altair_chart(bar, use_container_width=True)
+def build_bar():
+    return alt.Chart(top10).mark_bar().encode(
+        x=alt.X("국가명:N", sort=None),
+        y="외국인 입장객 수:Q",
+        tooltip=["국가명", "외국인 입장객 수"]
+    )
+with stage("chart", "국가별 TOP 10 막대"):
+    show_altair((mirrored.version, "top10"), build_bar, use_container_width=True)
 
 # ---------------- 일자별 변화 ----------------
 st.subheader("📅 일자별 총 방문객 수 변화")
-daily = df.groupby("입장일자")["외국인 입장객 수"].sum().reset_index()
+daily = summary.daily
 
-area = alt.Chart(daily).mark_area().encode(
-    x="입장일자:T",
-    y="외국인 입장객 수:Q"
-)
-st.altair_chart(area, use_container_width=True)
+def build_area():
+    return alt.Chart(daily).mark_area().encode(
+        x="입장일자:T",
+        y="외국인 입장객 수:Q"
+    )
+with stage("chart", "일자별 합계 영역"):
+    show_altair((mirrored.version, "daily"), build_area, use_container_width=True)
 
 # ---------------- 특정 국가 선택 ----------------
 st.subheader("📌 특정 국가 선택 분석")
-countries = sorted(df["국가명"].dropna().unique())
+countries = summary.countries
 selected = st.selectbox("국가 선택", countries)
 
-sel_df = df[df["국가명"] == selected].sort_values("입장일자")
+sel_df = summary.country_rows(selected)
 
-line = alt.Chart(sel_df).mark_line(point=True).encode(
-    x="입장일자:T",
-    y="외국인 입장객 수:Q"
-)
-st.altair_chart(line, use_container_width=True)
+def build_line():
+    return alt.Chart(sel_df).mark_line(point=True).encode(
+        x="입장일자:T",
+        y="외국인 입장객 수:Q"
+    )
+with stage("chart", "선택 국가 추이"):
+    show_altair((mirrored.version, "country", selected), build_line, use_container_width=True)
 
 # ---------------- 국가명 직접 검색 ----------------
 st.subheader("🔍 국가명 직접 검색")
 search = st.text_input("국가명을 입력하세요 (예: 미국)")
 
 if search:
-    if search in df["국가명"].unique():
-        sdf = df[df["국가명"] == search]
+    if search in summary:
+        sdf = summary.country_rows(search)
 
-        total = int(sdf["외국인 입장객 수"].sum())
+        total = summary.total(search)
         st.write(f"### ✔ 총 방문객 수: **{total}명**")
 
         st.write("📅 일자별 방문자 수")
-        st.dataframe(sdf[["입장일자", "외국인 입장객 수"]])
+        paginated_table(sdf, key="search", columns=["입장일자", "외국인 입장객 수"], page_size=25)
 
-        maxrow = sdf.loc[sdf["외국인 입장객 수"].idxmax()]
-        minrow = sdf.loc[sdf["외국인 입장객 수"].idxmin()]
+        maxrow, minrow = summary.extremes(search)
 
         st.write(f"🔥 최대 방문일: {maxrow['입장일자'].date()} — {int(maxrow['외국인 입장객 수'])}명")
         st.write(f"🧊 최소 방문일: {minrow['입장일자'].date()} — {int(minrow['외국인 입장객 수'])}명")
 
-        trend = alt.Chart(sdf).mark_line(point=True).encode(
-            x="입장일자:T",
-            y="외국인 입장객 수:Q"
-        )
-        st.altair_chart(trend, use_container_width=True)
+        def build_trend():
+            return alt.Chart(sdf).mark_line(point=True).encode(
+                x="입장일자:T",
+                y="외국인 입장객 수:Q"
+            )
+        with stage("chart", "검색 국가 추이"):
+            show_altair((mirrored.version, "search", search), build_trend, use_container_width=True)
     else:
         st.warning("해당 국가는 데이터에 없습니다.")
+
+show_panel()
@@ -0,0 +1,245 @@
+# ----------------------------------------------------------
+# 페이지 벤치마크 (네트워크 없이 AppTest로 모든 페이지 실행)
+# ----------------------------------------------------------
+# main.py와 pages/*.py를 Streamlit AppTest로 헤드리스 실행하면서
+# 페이지별 위젯 조작 시나리오(국가 선택, 날짜/호선 선택, URL 입력, 검색 등)를 재생하고
+# 콜드 스타트 / 재실행 지연 / 최대 RSS를 측정한다.
+# - 데이터는 번들 파일 규모의 1× / 10× / 100× 합성 데이터 (tools/gen_synthetic.py,
+#   .cache/bench/x<배율>/)를 환경변수(MBTI_COUNTRIES_CSV, SUBWAY_CSV, ADMISSIONS_CSV)로 물려서 쓴다.
+# - 07 페이지의 GitHub URL과 05 페이지의 URL 입력은 로컬 HTTP 서버가 대신한다.
+# - 페이지마다 새 프로세스에서 실행하므로 콜드 스타트에는 모듈 import와
+#   프로세스 내 캐시(st.cache_*) 생성이 포함되고, 최대 RSS도 페이지별로 따로 잰다.
+#   디스크 캐시(.cache의 Parquet/미러)는 지우지 않으므로 두 번째 실행부터는 따뜻한 상태다.
+#
+# 사용법: python tools/bench_pages.py [--scales 1 10 100] [--repeat 2] [--output bench_output.txt]
+
+import argparse
+import datetime
+import json
+import os
+import resource
+import statistics
+import subprocess
+import sys
+import threading
+import time
+from functools import partial
+from http.server import SimpleHTTPRequestHandler, ThreadingHTTPServer
+from pathlib import Path
+from urllib.parse import quote
+
+ROOT = Path(__file__).resolve().parent.parent
+BENCH_DIR = ROOT / ".cache" / "bench"
+DEFAULT_PORT = 8799  # 미러 캐시(.cache/mirror)가 실행마다 늘지 않도록 고정 포트 사용
+
+PAGES = ["main.py"] + sorted(p.relative_to(ROOT).as_posix() for p in (ROOT / "pages").glob("*.py"))
+
+
+# ---------------- 합성 데이터 ----------------
+def build_datasets(scale: int, out_dir: Path, regen: bool = False) -> dict:
+    """번들 데이터 규모의 scale배인 합성 파일 세 개를 만들고 {환경변수: 경로}를 반환
+
+    tools/gen_synthetic.py로 스트리밍 생성한다.
+    - MBTI: 국가 158 × scale개
+    - 지하철: 하루 약 617개 역, 기간 30 × scale일 (CP949)
+    - 입장: 하루 약 10개 국가, 기간 31 × scale일 (CP949)
+    """
+    from tools.gen_synthetic import write_admissions, write_mbti, write_subway
+
+    paths = {
+        "MBTI_COUNTRIES_CSV": out_dir / "countriesMBTI_16types.csv",
+        "SUBWAY_CSV": out_dir / "wnlgkcjf.csv",
+        "ADMISSIONS_CSV": out_dir / "admissions.csv",
+    }
+    if not regen and all(p.is_file() for p in paths.values()):
+        return paths
+    write_mbti(paths["MBTI_COUNTRIES_CSV"], 158 * scale, seed=scale)
+    write_subway(paths["SUBWAY_CSV"], 18504 * scale, start="2025-09-01", days=30 * scale, seed=scale)
+    write_admissions(paths["ADMISSIONS_CSV"], 305 * scale, start="2025-08-01", days=31 * scale, seed=scale)
+    return paths
+
+
+class _QuietHandler(SimpleHTTPRequestHandler):
+    def log_message(self, *args):
+        pass
+
+
+def serve_directory(directory: Path, port: int):
+    """directory를 정적 파일로 제공하는 로컬 HTTP 서버 (데몬 스레드)"""
+    server = ThreadingHTTPServer(("127.0.0.1", port), partial(_QuietHandler, directory=str(directory)))
+    threading.Thread(target=server.serve_forever, daemon=True).start()
+    return server
+
+
+# ---------------- 페이지별 시나리오 ----------------
+# 각 단계는 AppTest를 받아 위젯 하나를 조작한다 (단계마다 재실행 1회).
+def _find(widgets, label):
+    for w in widgets:
+        if w.label.startswith(label):
+            return w
+    raise LookupError(f"위젯을 찾을 수 없습니다: {label}")
+
+
+def _set(kind, label, value):
+    """label로 시작하는 위젯에 value를 설정 (value가 함수면 위젯을 받아 값을 계산)"""
+    def step(at):
+        w = _find(getattr(at, kind), label)
+        w.set_value(value(w) if callable(value) else value)
+    step.__name__ = f"{kind}:{label}"
+    return step
+
+
+def _option(i):
+    return lambda w: w.options[min(i, len(w.options) - 1)]
+
+
+def _click(label):
+    def step(at):
+        _find(at.button, label).click()
+    step.__name__ = f"button:{label}"
+    return step
+
+
+def _rerun(at):
+    pass
+
+
+SCENARIOS = {
+    "main": [_set("text_input", "이름", "벤치"), _click("인사말 생성")],
+    "00": [_set("selectbox", "🌷", "ENFP"), _set("selectbox", "🌷", "ISTJ")],
+    "01": [
+        _set("selectbox", "MBTI 유형", "INFP"), _set("selectbox", "MBTI 유형", "ESTJ"),
+        _set("selectbox", "섞을 유형", "ENFP"), _set("selectbox", "나라 선택", _option(10)),
+    ],
+    "02": [_rerun],
+    "03": [
+        _set("selectbox", "국가 선택", _option(10)),
+        _set("selectbox", "국가 선택", lambda w: w.options[-1]),
+        _set("selectbox", "MBTI 유형 선택", "ENFP"),
+        _set("radio", "거리 기준", "euclidean"),
+        _set("slider", "군집 수", 8),
+    ],
+    "04": [
+        _set("date_input", "날짜 선택", lambda w: w.value - datetime.timedelta(days=1)),
+        _set("selectbox", "호선 선택", _option(1)),
+        _set("selectbox", "역 선택", _option(1)),
+        _set("slider", "z-점수 기준", 2.0),
+        _set("checkbox", "선택한 호선만", True),
+    ],
+    "05": [
+        _set("text_input", "또는 GitHub raw URL", lambda w: os.environ["BENCH_ADMISSIONS_URL"]),
+        _set("selectbox", "국가 선택", _option(1)),
+        _set("text_input", "국가명을 직접", "미국"),
+        _set("text_input", "검색", "2025"),
+    ],
+    "07": [
+        _set("selectbox", "국가 선택", _option(1)),
+        _set("text_input", "국가명을 입력", "미국"),
+    ],
+}
+
+
+def scenario_for(page: str):
+    name = Path(page).stem
+    return SCENARIOS.get("main" if name == "main" else name[:2], [_rerun])
+
+
+def peak_rss_mb() -> float:
+    peak = resource.getrusage(resource.RUSAGE_SELF).ru_maxrss
+    return peak / 2**20 if sys.platform == "darwin" else peak / 1024  # macOS는 바이트, 리눅스는 KB
+
+
+def run_worker(page: str, repeat: int, timeout: float) -> dict:
+    """(자식 프로세스) 페이지 하나를 콜드 실행 후 시나리오를 repeat번 재생"""
+    os.chdir(ROOT)
+    sys.path.insert(0, str(ROOT))
+    from streamlit.testing.v1 import AppTest
+
+    result = {"page": page, "errors": []}
+    at = AppTest.from_file(str(ROOT / page), default_timeout=timeout)
+    t0 = time.perf_counter()
+    at.run()
+    result["cold_ms"] = (time.perf_counter() - t0) * 1000
+    result["errors"] += [e.value for e in at.exception]
+
+    reruns = []
+    for _ in range(repeat):
+        for step in scenario_for(page):
+            try:
+                step(at)
+            except Exception as e:  # 위젯이 없으면(앞 단계 오류 등) 기록만 하고 계속
+                result["errors"].append(f"{step.__name__}: {e}")
+                continue
+            t0 = time.perf_counter()
+            at.run()
+            reruns.append((time.perf_counter() - t0) * 1000)
+            result["errors"] += [e.value for e in at.exception]
+    result["rerun_ms"] = reruns
+    result["peak_rss_mb"] = peak_rss_mb()
+    result["errors"] = sorted(set(map(str, result["errors"])))
+    return result
+
+
+def run_page(page: str, env: dict, repeat: int, timeout: float) -> dict:
+    cmd = [sys.executable, __file__, "--worker", page, "--repeat", str(repeat), "--timeout", str(timeout)]
+    proc = subprocess.run(cmd, env=env, cwd=ROOT, capture_output=True, text=True)
+    lines = [l for l in proc.stdout.splitlines() if l.startswith("{")]
+    if proc.returncode != 0 or not lines:
+        err = (proc.stderr.strip().splitlines() or ["알 수 없는 오류"])[-1]
+        return {"page": page, "cold_ms": None, "rerun_ms": [], "peak_rss_mb": None, "errors": [err]}
+    return json.loads(lines[-1])
+
+
+def format_row(scale: int, r: dict) -> str:
+    def ms(v):
+        return "-" if v is None else f"{v:,.0f}"
+    reruns = r["rerun_ms"]
+    med = statistics.median(reruns) if reruns else None
+    worst = max(reruns) if reruns else None
+    rss = "-" if r["peak_rss_mb"] is None else f"{r['peak_rss_mb']:,.0f}"
+    err = r["errors"][0][:60] if r["errors"] else ""
+    return f"{scale:>4}x  {r['page']:<32} {ms(r['cold_ms']):>9} {ms(med):>9} {ms(worst):>9} {rss:>8}  {err}"
+
+
+def main():
+    parser = argparse.ArgumentParser(description="AppTest로 모든 페이지를 실행해 지연/메모리를 측정")
+    parser.add_argument("--scales", type=int, nargs="+", default=[1, 10, 100])
+    parser.add_argument("--pages", nargs="+", default=PAGES, help="측정할 페이지 (기본: 전체)")
+    parser.add_argument("--repeat", type=int, default=2, help="시나리오 반복 횟수")
+    parser.add_argument("--timeout", type=float, default=600, help="재실행 1회 제한 시간(초)")
+    parser.add_argument("--port", type=int, default=DEFAULT_PORT)
+    parser.add_argument("--regen", action="store_true", help="합성 데이터를 다시 생성")
+    parser.add_argument("--output", help="결과 표를 저장할 파일")
+    parser.add_argument("--worker", help=argparse.SUPPRESS)
+    args = parser.parse_args()
+
+    if args.worker:
+        print(json.dumps(run_worker(args.worker, args.repeat, args.timeout), ensure_ascii=False))
+        return
+
+    sys.path.insert(0, str(ROOT))
+    server = serve_directory(BENCH_DIR, args.port)
+    header = f"{'scale':>5}  {'page':<32} {'cold ms':>9} {'rerun p50':>9} {'rerun max':>9} {'RSS MB':>8}  errors"
+    lines = [header, "-" * len(header)]
+    print(header, flush=True)
+    try:
+        for scale in args.scales:
+            out_dir = BENCH_DIR / f"x{scale}"
+            t0 = time.perf_counter()
+            paths = build_datasets(scale, out_dir, args.regen)
+            print(f"# {scale}x 데이터 준비 {time.perf_counter() - t0:.1f}s ({out_dir})", flush=True)
+            url = f"http://127.0.0.1:{args.port}/x{scale}/{quote(paths['ADMISSIONS_CSV'].name)}"
+            env = dict(os.environ, **{k: str(v) for k, v in paths.items()},
+                       ADMISSIONS_CSV_URL=url, BENCH_ADMISSIONS_URL=url)
+            for page in args.pages:
+                row = format_row(scale, run_page(page, env, args.repeat, args.timeout))
+                print(row, flush=True)
+                lines.append(row)
+    finally:
+        server.shutdown()
+    if args.output:
+        Path(args.output).write_text("\n".join(lines) + "\n", encoding="utf-8")
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,66 @@
+# ----------------------------------------------------------
+# 나라별 추천(weighted_top_k)과 단일 추천(top_k) 일치 확인
+# ----------------------------------------------------------
+# 나라별 추천 표는 항목 블록마다 상위 k개를 합쳐 가며 구한다. 그 결과가 나라마다
+# top_k(distribution[i] @ scores.T, k)를 따로 계산한 것과 같은지(같은 점수는 앞 위치 먼저)
+# 번들 데이터와 합성 카탈로그(동점이 많은 경우 / 블록이 여러 개인 경우)로 확인한다.
+# 다르면 종료 코드 1.
+#
+# 사용법: python tools/check_recommender.py [--items 20000] [--k 5 10]
+
+import argparse
+import sys
+from pathlib import Path
+
+import numpy as np
+
+ROOT = Path(__file__).resolve().parent.parent
+sys.path.insert(0, str(ROOT))
+
+from common.datasets import load_dataset  # noqa: E402
+from common.mbti import type_matrix  # noqa: E402
+from common.mbti_similarity import to_distribution  # noqa: E402
+from common.recommendations import MBTI_TYPES, Catalogue  # noqa: E402
+from common.recommender import Recommender, top_k, weighted_top_k  # noqa: E402
+
+
+def mismatches(distribution, scores, k, block) -> int:
+    idx, _ = weighted_top_k(distribution, scores, k, block=block)
+    blended = distribution.astype("float32") @ scores.T
+    return sum(not np.array_equal(idx[i], top_k(blended[i], k)) for i in range(len(distribution)))
+
+
+def synthetic_scores(n: int, seed: int = 0):
+    """features가 없는 항목(동점 많음)과 있는 항목이 섞인 카탈로그의 점수 행렬"""
+    rng = np.random.default_rng(seed)
+    items = [
+        {"id": str(i), "type": MBTI_TYPES[rng.integers(16)], "category": "movie", "title": str(i),
+         "features": rng.uniform(-1, 1, 4).round(1).tolist() if i % 3 else None}
+        for i in range(n)
+    ]
+    return Recommender(Catalogue(items)).type_scores("movie")[1]
+
+
+def main():
+    parser = argparse.ArgumentParser(description="weighted_top_k와 top_k 결과 비교")
+    parser.add_argument("--items", type=int, default=20_000, help="합성 카탈로그 항목 수")
+    parser.add_argument("--k", type=int, nargs="+", default=[5, 10], help="비교할 상위 개수")
+    args = parser.parse_args()
+
+    countries, matrix = type_matrix(load_dataset("mbti_countries"), MBTI_TYPES)
+    distribution = to_distribution(matrix)
+    recommender = Recommender(load_dataset("mbti_recommendations"))
+
+    failed = 0
+    cases = [(f"번들 {c}", recommender.type_scores(c)[1], block) for c in ("movie", "book") for block in (8192, 7)]
+    cases += [(f"합성 {args.items:,}개", synthetic_scores(args.items), block) for block in (8192, 1000)]
+    for k in args.k:
+        for name, scores, block in cases:
+            bad = mismatches(distribution, scores, k, block)
+            failed += bad
+            print(f"{name:<16} k={k:<3} block={block:<5} 국가 {len(distribution)}개 중 불일치 {bad}")
+    sys.exit(1 if failed else 0)
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,55 @@
+# ----------------------------------------------------------
+# 표 페이지 나누기(page_slice)와 전체 정렬 일치 확인
+# ----------------------------------------------------------
+# 모든 페이지를 이어 붙인 결과가 df.sort_values(kind="stable")와 같은지
+# (같은 값이 많은 열 / 정수·실수·불리언 열 / 오름·내림차순 / 여러 페이지 크기) 확인한다.
+# 다르면 종료 코드 1.
+#
+# 사용법: python tools/check_table_view.py [--rows 1000]
+
+import argparse
+import sys
+from pathlib import Path
+
+import numpy as np
+import pandas as pd
+
+ROOT = Path(__file__).resolve().parent.parent
+sys.path.insert(0, str(ROOT))
+
+from common.table_view import page_slice  # noqa: E402
+
+
+def all_pages(df, size, sort_col, ascending) -> pd.DataFrame:
+    return pd.concat([page_slice(df, start, min(start + size, len(df)), sort_col, ascending)
+                      for start in range(0, len(df), size)])
+
+
+def main():
+    parser = argparse.ArgumentParser(description="page_slice 결과와 전체 정렬 비교")
+    parser.add_argument("--rows", type=int, default=1000, help="합성 표 행 수")
+    args = parser.parse_args()
+
+    rng = np.random.default_rng(0)
+    df = pd.DataFrame({
+        "동점많음": rng.integers(0, 5, args.rows),
+        "정수": rng.integers(-1000, 1000, args.rows),
+        "실수": rng.normal(size=args.rows).round(1),
+        "불리언": rng.integers(0, 2, args.rows).astype(bool),
+    }, index=rng.permutation(args.rows))
+
+    failed = 0
+    for col in df.columns:
+        for ascending in (True, False):
+            expected = df.sort_values(col, ascending=ascending, kind="stable")
+            for size in (25, 50, 200):
+                got = all_pages(df, size, col, ascending)
+                ok = got.index.equals(expected.index)
+                failed += not ok
+                print(f"{col:<6} {'오름' if ascending else '내림'} 페이지 {size:<4} "
+                      f"고유 행 {got.index.nunique():,}/{len(df):,} {'일치' if ok else '불일치'}")
+    sys.exit(1 if failed else 0)
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,200 @@
+# ----------------------------------------------------------
+# 규모 시험용 합성 데이터 생성기
+# ----------------------------------------------------------
+# 번들 데이터는 작아서(국가 158개, 지하철 18.5k행, 입장 305행) 실제 규모에서는
+# 시험해 본 적이 없다. 여기서는 원본과 같은 스키마/인코딩의 파일을 원하는 행 수와
+# 기간으로 만든다. 하루(또는 일정 행 수) 단위로 만들어 바로 파일에 쓰므로
+# 전체 데이터를 메모리에 올리지 않는다.
+# - subway: CP949, 사용일자(YYYYMMDD)/노선명/역명/승차총승객수/하차총승객수 (날짜 오름차순)
+# - mbti: UTF-8, Country + 16개 MBTI 비율 (행 합 = 1)
+# - admissions: CP949, 입장일자(YYYY-MM-DD)/국가명/외국인 입장객 수 (날짜 오름차순)
+# 역/국가 이름은 번들 파일에서 가져오고, 모자라면 번호를 붙인 가상 이름을 만든다.
+#
+# 사용법:
+#   python tools/gen_synthetic.py subway out.csv --rows 2000000 --start 2024-01-01 --days 365
+#   python tools/gen_synthetic.py mbti out.csv --rows 20000
+#   python tools/gen_synthetic.py admissions out.csv --rows 100000 --start 2020-01-01 --days 1500
+
+import argparse
+import os
+import sys
+from pathlib import Path
+
+import numpy as np
+import pandas as pd
+
+ROOT = Path(__file__).resolve().parent.parent
+sys.path.insert(0, str(ROOT))
+
+from common.mbti import MBTI_COLUMNS  # noqa: E402
+
+CHUNK_ROWS = 200_000  # 한 번에 만들어 쓰는 최대 행 수
+
+
+def _bundled(filename: str):
+    """번들 CSV (이름 목록용). 없으면 None"""
+    path = ROOT / filename
+    if not path.is_file():
+        return None
+    from common.csv_loader import read_csv_auto
+    return read_csv_auto(path)
+
+
+def _names(base: list, n: int, fmt: str) -> list:
+    """base 이름을 먼저 쓰고 모자라면 fmt로 가상 이름을 만든다"""
+    extra = [fmt.format(i) for i in range(1, n - len(base) + 1)]
+    return (list(base) + extra)[:n]
+
+
+def _write_chunks(path, chunks, encoding: str) -> int:
+    """DataFrame 조각들을 임시 파일에 이어 쓰고 끝나면 path로 교체. 쓴 행 수 반환"""
+    path = Path(path)
+    path.parent.mkdir(parents=True, exist_ok=True)
+    tmp = path.with_name(path.name + ".tmp")
+    total = 0
+    with open(tmp, "w", encoding=encoding, newline="") as f:
+        for i, chunk in enumerate(chunks):
+            chunk.to_csv(f, index=False, header=(i == 0), lineterminator="\r\n")
+            total += len(chunk)
+    os.replace(tmp, path)
+    return total
+
+
+def _day_batches(days: int, per_day: int):
+    """CHUNK_ROWS를 넘지 않도록 날짜를 묶은 (시작, 끝) 구간"""
+    step = max(1, CHUNK_ROWS // max(per_day, 1))
+    for s in range(0, days, step):
+        yield s, min(days, s + step)
+
+
+# ---------------- 지하철 ----------------
+def subway_chunks(rows: int, start: str, days: int, seed: int = 0):
+    """하루에 역마다 한 행씩, 역별 기본 수준 × 요일 효과 × 잡음 (가끔 급증/급감)"""
+    rng = np.random.default_rng(seed)
+    per_day = -(-rows // days)
+    real = _bundled("wnlgkcjf.csv")
+    if real is not None:
+        pairs = real[["노선명", "역명"]].drop_duplicates().values.tolist()
+    else:
+        pairs = []
+    lines = sorted({l for l, _ in pairs}) or [f"{i}호선" for i in range(1, 10)]
+    pairs += [(lines[i % len(lines)], f"가상역{i + 1}") for i in range(max(0, per_day - len(pairs)))]
+    pairs = pairs[:per_day]
+    line_col = np.array([l for l, _ in pairs], dtype=object)
+    station_col = np.array([s for _, s in pairs], dtype=object)
+    level = rng.lognormal(mean=9.0, sigma=0.8, size=per_day)
+
+    dates = pd.date_range(start, periods=days, freq="D")
+    weekend = np.asarray(dates.dayofweek >= 5)
+    written = 0
+    for s, e in _day_batches(days, per_day):
+        n_days = e - s
+        n = min(n_days * per_day, rows - written)
+        if n <= 0:
+            return
+        effect = np.where(weekend[s:e], 0.65, 1.0)[:, None]
+        noise = rng.normal(1.0, 0.08, size=(n_days, per_day)).clip(0.2)
+        spikes = rng.random((n_days, per_day)) < 0.001
+        noise[spikes] *= rng.choice([0.2, 3.0], size=spikes.sum())
+        on = (level * effect * noise).ravel()[:n]
+        off = on * rng.normal(1.0, 0.05, size=on.size).clip(0.5)
+        written += n
+        yield pd.DataFrame({
+            "사용일자": np.repeat(dates[s:e].strftime("%Y%m%d"), per_day)[:n],
+            "노선명": np.tile(line_col, n_days)[:n],
+            "역명": np.tile(station_col, n_days)[:n],
+            "승차총승객수": np.maximum(on, 1).astype(np.int64),
+            "하차총승객수": np.maximum(off, 1).astype(np.int64),
+        })
+
+
+def write_subway(path, rows: int, start: str = "2025-01-01", days: int = 30, seed: int = 0) -> int:
+    return _write_chunks(path, subway_chunks(rows, start, days, seed), "cp949")
+
+
+# ---------------- MBTI ----------------
+def mbti_chunks(rows: int, seed: int = 0):
+    """국가별 16유형 비율: 번들 평균 분포 주변의 디리클레 표본 (행 합 = 1)"""
+    rng = np.random.default_rng(seed)
+    real = _bundled("countriesMBTI_16types.csv")
+    if real is not None:
+        mean = real[MBTI_COLUMNS].mean().to_numpy()
+        base = real["Country"].tolist()
+    else:
+        mean = np.full(len(MBTI_COLUMNS), 1 / len(MBTI_COLUMNS))
+        base = []
+    alpha = mean / mean.sum() * 400
+    names = _names(base, rows, "Country {}")
+    for s in range(0, rows, CHUNK_ROWS):
+        e = min(rows, s + CHUNK_ROWS)
+        part = pd.DataFrame(rng.dirichlet(alpha, size=e - s).round(4), columns=MBTI_COLUMNS)
+        part.insert(0, "Country", names[s:e])
+        yield part
+
+
+def write_mbti(path, rows: int, seed: int = 0) -> int:
+    return _write_chunks(path, mbti_chunks(rows, seed), "utf-8")
+
+
+# ---------------- 강원랜드 입장 ----------------
+def admissions_chunks(rows: int, start: str = "2025-08-01", days: int = 31, seed: int = 0):
+    """하루마다 국가 몇 개를 인기도 비율로 뽑고 국가별 평균 주변의 포아송 입장객 수"""
+    rng = np.random.default_rng(seed)
+    per_day = -(-rows // days)
+    real = _bundled("인공지능 수행.csv")
+    if real is not None:
+        stats = real.groupby("국가명")["외국인 입장객 수"].agg(["size", "mean"])
+        base, weight, lam = stats.index.tolist(), stats["size"].to_numpy(float), stats["mean"].to_numpy(float)
+    else:
+        base, weight, lam = [], np.array([]), np.array([])
+    countries = _names(base, max(per_day, len(base)), "국가{}")
+    extra = len(countries) - len(base)
+    weight = np.concatenate([weight, np.ones(extra)])
+    lam = np.concatenate([lam, np.full(extra, 2.0)])
+    p = weight / weight.sum()
+
+    dates = pd.date_range(start, periods=days, freq="D").strftime("%Y-%m-%d")
+    written = 0
+    for s, e in _day_batches(days, per_day):
+        parts = []
+        for d in range(s, e):
+            n = min(per_day, rows - written)
+            if n <= 0:
+                break
+            picked = np.sort(rng.choice(len(countries), size=n, replace=False, p=p))
+            parts.append(pd.DataFrame({
+                "입장일자": dates[d],
+                "국가명": np.asarray(countries, dtype=object)[picked],
+                "외국인 입장객 수": np.maximum(rng.poisson(lam[picked]), 1),
+            }))
+            written += n
+        if not parts:
+            return
+        yield pd.concat(parts, ignore_index=True)
+
+
+def write_admissions(path, rows: int, start: str = "2025-08-01", days: int = 31, seed: int = 0) -> int:
+    return _write_chunks(path, admissions_chunks(rows, start, days, seed), "cp949")
+
+
+def main():
+    parser = argparse.ArgumentParser(description="스키마가 같은 합성 CSV를 원하는 크기로 생성")
+    parser.add_argument("kind", choices=["subway", "mbti", "admissions"])
+    parser.add_argument("out", help="출력 CSV 경로")
+    parser.add_argument("--rows", type=int, required=True, help="데이터 행 수 (mbti는 국가 수)")
+    parser.add_argument("--start", default=None, help="시작 날짜 (YYYY-MM-DD)")
+    parser.add_argument("--days", type=int, default=None, help="기간 (일)")
+    parser.add_argument("--seed", type=int, default=0)
+    args = parser.parse_args()
+
+    if args.kind == "mbti":
+        n = write_mbti(args.out, args.rows, args.seed)
+    elif args.kind == "subway":
+        n = write_subway(args.out, args.rows, args.start or "2025-01-01", args.days or 30, args.seed)
+    else:
+        n = write_admissions(args.out, args.rows, args.start or "2025-08-01", args.days or 31, args.seed)
+    print(f"{args.out}: {n:,}행")
+
+
+if __name__ == "__main__":
+    main()
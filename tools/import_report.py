@@ -0,0 +1,71 @@
+# ----------------------------------------------------------
+# 페이지별 import 비용 보고서
+# ----------------------------------------------------------
+# 페이지마다 새 프로세스에서 `python -X importtime`으로 AppTest 첫 실행을 하고,
+# Streamlit/AppTest 자체를 불러온 뒤에 페이지가 추가로 import 한 모듈만 모아
+# 최상위 패키지별 누적 시간(ms)을 보여 준다. 콜드 스타트에서 import가 차지하는 몫과
+# 어떤 라이브러리가 무거운지 확인할 때 쓴다.
+#
+# 사용법: python tools/import_report.py [페이지 ...] [--top 8]
+
+import argparse
+import os
+import re
+import subprocess
+import sys
+from pathlib import Path
+
+ROOT = Path(__file__).resolve().parent.parent
+PAGES = ["main.py"] + sorted(p.relative_to(ROOT).as_posix() for p in (ROOT / "pages").glob("*.py"))
+MARKER = "--- page import start ---"
+LINE_RE = re.compile(r"import time:\s+(\d+) \|\s+(\d+) \|( *)(\S+)")
+
+
+def run_worker(page: str):
+    """(자식 프로세스) Streamlit을 먼저 불러오고 표시를 남긴 뒤 페이지를 한 번 실행"""
+    os.chdir(ROOT)
+    sys.path.insert(0, str(ROOT))
+    from streamlit.testing.v1 import AppTest
+
+    print(MARKER, file=sys.stderr, flush=True)
+    AppTest.from_file(str(ROOT / page), default_timeout=600).run()
+
+
+def page_import_costs(page: str) -> dict:
+    """페이지가 새로 import 한 최상위 패키지 → 누적 ms"""
+    cmd = [sys.executable, "-X", "importtime", __file__, "--worker", page]
+    proc = subprocess.run(cmd, cwd=ROOT, capture_output=True, text=True)
+    _, _, after = proc.stderr.partition(MARKER)
+    costs = {}
+    for line in after.splitlines():
+        m = LINE_RE.match(line)
+        if not m:
+            continue
+        # 들여쓰기가 가장 얕은(한 칸) 항목이 그 시점에 새로 불러온 최상위 import
+        if len(m.group(3)) == 1:
+            top = m.group(4).split(".")[0]
+            costs[top] = costs.get(top, 0.0) + int(m.group(2)) / 1000
+    return costs
+
+
+def main():
+    parser = argparse.ArgumentParser(description="페이지별로 새로 import 되는 모듈과 비용")
+    parser.add_argument("pages", nargs="*", default=PAGES)
+    parser.add_argument("--top", type=int, default=8, help="페이지마다 보여 줄 패키지 수")
+    parser.add_argument("--worker", help=argparse.SUPPRESS)
+    args = parser.parse_args()
+
+    if args.worker:
+        run_worker(args.worker)
+        return
+
+    for page in args.pages:
+        costs = page_import_costs(page)
+        total = sum(costs.values())
+        print(f"{page}: import 합계 {total:,.0f} ms")
+        for name, ms in sorted(costs.items(), key=lambda kv: kv[1], reverse=True)[:args.top]:
+            print(f"    {name:<24} {ms:>8,.1f} ms")
+
+
+if __name__ == "__main__":
+    main()